@@ -1,11 +1,17 @@
+from array import array
+from collections import deque
+import heapq
+import itertools
 import sys
+import time
 
 
 class Node:
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 class StackFrontier:
@@ -40,43 +46,121 @@ class QueueFrontier(StackFrontier):
             return node
 
 
+class FastStackFrontier:
+    """Stack frontier with a state lookup table, so contains_state is O(1)."""
+
+    def __init__(self):
+        self.frontier = []
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.pop())
+
+
+class FastQueueFrontier(FastStackFrontier):
+    """Deque-backed queue frontier with O(1) remove and contains_state."""
+
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.popleft())
+
+
+class PriorityFrontier(FastStackFrontier):
+    """Heap-backed frontier that removes the node with the lowest priority(node)."""
+
+    def __init__(self, priority):
+        super().__init__()
+        self.priority = priority
+        self.counter = itertools.count()
+
+    def add(self, node):
+        heapq.heappush(self.frontier, (self.priority(node), next(self.counter), node))
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(heapq.heappop(self.frontier)[2])
+
+
 class Maze:
-    def __init__(self, filename):
+    def __init__(self, filename, multiple_goals=False):
         # Read file and set height and width of maze
         with open(filename) as f:
             contents = f.read()
 
-        # Validate start and goal
+        # Validate start and goal. With multiple_goals, every B is a goal:
+        # they are all kept in the set self.goals and self.goal is the first one
         if contents.count("A") != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if contents.count("B") != 1 and not (multiple_goals and contents.count("B") > 0):
             raise Exception("maze must have exactly one goal")
+        goals = []
 
         # Determine height and width of maze
         contents = contents.splitlines()
         self.height = len(contents)
         self.width = max(len(line) for line in contents)
 
-        # Keep track of walls
+        # Keep track of walls, and the cost of stepping onto each cell:
+        # 1 for open cells, 2-9 for cells marked with that digit
         self.walls = []
+        self.weights = []
         for i in range(self.height):
             row = []
+            weights = []
             for j in range(self.width):
                 try:
                     if contents[i][j] == "A":
                         self.start = (i, j)
                         row.append(False)
                     elif contents[i][j] == "B":
-                        self.goal = (i, j)
+                        goals.append((i, j))
                         row.append(False)
                     elif contents[i][j] == " ":
                         row.append(False)
+                    elif contents[i][j] in "123456789":
+                        row.append(False)
+                        weights.append(int(contents[i][j]))
+                        continue
                     else:
                         row.append(True)
                 except IndexError:
                     row.append(False)
+                weights.append(1)
             self.walls.append(row)
+            self.weights.append(weights)
 
+        self.goal = goals[0]
+        self.goals = set(goals)
         self.solution = None
 
     def print(self):
@@ -88,10 +172,12 @@ class Maze:
                     print("#", end="")
                 elif (i, j) == self.start:
                     print("A", end="")
-                elif (i, j) == self.goal:
+                elif (i, j) in self.goals:
                     print("B", end="")
                 elif solution is not None and (i, j) in solution:
                     print("*", end="")
+                elif self.weights[i][j] > 1:
+                    print(self.weights[i][j], end="")
                 else:
                     print(" ", end="")
             print()
@@ -112,15 +198,26 @@ class Maze:
                 result.append((action, (r, c)))
         return result
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def solve(self, algorithm="dfs"):
+        """
+        Finds a solution to maze, if one exists.
+
+        algorithm is "dfs" or "bfs" (uninformed, ignoring cell weights),
+        "astar" (cheapest path by cell weights) or "greedy" (greedy
+        best-first). Sets num_explored, solve_time (seconds) and cost.
+        """
+        if algorithm in ("astar", "greedy"):
+            return self.solve_best_first(greedy=algorithm == "greedy")
+        if algorithm not in ("dfs", "bfs"):
+            raise ValueError(f"unknown algorithm: {algorithm}")
+        solve_start = time.perf_counter()
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
+        frontier = FastStackFrontier() if algorithm == "dfs" else FastQueueFrontier()
         frontier.add(start)
 
         # Initialize an empty explored set
@@ -147,6 +244,8 @@ class Maze:
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                self.cost = sum(self.weights[i][j] for i, j in cells)
+                self.solve_time = time.perf_counter() - solve_start
                 print(self.solution)
                 return
 
@@ -159,6 +258,90 @@ class Maze:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
 
+    def distance_field(self, source=None):
+        """Returns a DistanceField from source (default: the start) to every reachable cell."""
+        return DistanceField(self, source)
+
+    def solve_nearest(self, goals=None):
+        """
+        Finds the shortest path (in steps) from the start to whichever of
+        goals (default: every B in the maze) is nearest, stopping as soon
+        as the first one is reached. Sets solution, explored, num_explored,
+        solve_time and cost like solve, and returns the goal that was reached.
+        """
+        solve_start = time.perf_counter()
+        field = DistanceField(self, goals=goals if goals is not None else self.goals)
+        self.explored = field.explored
+        self.num_explored = field.num_explored
+        if field.reached is None:
+            raise Exception("no solution")
+        self.solution = field.path(field.reached)
+        self.cost = sum(self.weights[i][j] for i, j in self.solution[1])
+        self.solve_time = time.perf_counter() - solve_start
+        return field.reached
+
+    def heuristic(self, state):
+        """Manhattan distance from state to the goal (every step costs at least 1)."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+    def solve_best_first(self, greedy=False):
+        """
+        A* search (or greedy best-first search if greedy is True) with the
+        Manhattan heuristic. Entering a cell costs its weight.
+
+        The frontier may hold several nodes for one cell, and only the first
+        one removed is expanded. Closed cells are marked in a bytearray
+        indexed by row * width + col.
+        """
+        solve_start = time.perf_counter()
+        self.num_explored = 0
+
+        if greedy:
+            frontier = PriorityFrontier(lambda node: self.heuristic(node.state))
+        else:
+            # Break ties on f towards the node closer to the goal
+            frontier = PriorityFrontier(
+                lambda node: (node.cost + self.heuristic(node.state), self.heuristic(node.state))
+            )
+        frontier.add(Node(state=self.start, parent=None, action=None))
+
+        closed = bytearray(self.height * self.width)
+        best_cost = {self.start: 0}
+        self.explored = set()
+
+        while not frontier.empty():
+            node = frontier.remove()
+            row, col = node.state
+            if closed[row * self.width + col]:
+                continue
+            closed[row * self.width + col] = 1
+            self.explored.add(node.state)
+            self.num_explored += 1
+
+            if node.state == self.goal:
+                self.cost = node.cost
+                actions = []
+                cells = []
+                while node.parent is not None:
+                    actions.append(node.action)
+                    cells.append(node.state)
+                    node = node.parent
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                self.solve_time = time.perf_counter() - solve_start
+                return
+
+            for action, (r, c) in self.neighbors(node.state):
+                if closed[r * self.width + c]:
+                    continue
+                cost = node.cost + self.weights[r][c]
+                if cost < best_cost.get((r, c), cost + 1):
+                    best_cost[(r, c)] = cost
+                    frontier.add(Node(state=(r, c), parent=node, action=action, cost=cost))
+
+        raise Exception("no solution")
+
     def output_image(self, filename, show_solution=True, show_explored=False):
         from PIL import Image, ImageDraw
 
@@ -183,7 +366,7 @@ class Maze:
                     fill = (255, 0, 0)
 
                 # Goal
-                elif (i, j) == self.goal:
+                elif (i, j) in self.goals:
                     fill = (0, 171, 28)
 
                 # Solution
@@ -214,16 +397,389 @@ class Maze:
 
         img.save(filename)
 
+    def wall_mask(self):
+        """Returns a height x width NumPy bool array, True for walls."""
+        import numpy as np
+        return np.array(self.walls, dtype=bool).reshape(self.height, self.width)
+
+    def cell_mask(self, cells):
+        """Returns a height x width NumPy bool array, True for the given (i, j) cells."""
+        import numpy as np
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        cells = list(cells)
+        if cells:
+            rows, cols = zip(*cells)
+            mask[list(rows), list(cols)] = True
+        return mask
+
+    def explored_mask(self):
+        return self.cell_mask(self.explored)
+
+    def output_image_fast(self, filename, show_solution=True, show_explored=False, cell_size=50, cell_border=2):
+        """
+        Same picture as output_image, but built as one NumPy RGBA array:
+        every cell gets a color from the wall/solution/explored masks, and
+        the cells are scaled up to cell_size blocks in a single assignment.
+        Use a smaller cell_size for very large mazes.
+        """
+        import numpy as np
+        from PIL import Image
+
+        # Later layers win, so paint in the reverse of output_image's order
+        colors = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        colors[:] = (237, 240, 252, 255)
+        if self.solution is not None and show_explored:
+            colors[self.explored_mask()] = (212, 97, 85, 255)
+        if self.solution is not None and show_solution:
+            colors[self.cell_mask(self.solution[1])] = (220, 235, 113, 255)
+        colors[tuple(zip(*self.goals))] = (0, 171, 28, 255)
+        colors[self.start] = (255, 0, 0, 255)
+        colors[self.wall_mask()] = (40, 40, 40, 255)
+
+        # Each cell is a cell_size block: black border, colored inside
+        # (output_image's rectangles include both corner pixels)
+        pixels = np.zeros((self.height, cell_size, self.width, cell_size, 4), dtype=np.uint8)
+        pixels[..., 3] = 255
+        inside = slice(cell_border, cell_size - cell_border + 1)
+        pixels[:, inside, :, inside] = colors[:, None, :, None]
+
+        # Big images spend most of their time in PNG compression, so favor speed
+        img = Image.fromarray(pixels.reshape(self.height * cell_size, self.width * cell_size, 4), "RGBA")
+        img.save(filename, compress_level=1)
+
+
+# Byte values of the characters in a maze file, mapped to 1 for walls and 0 for
+# open cells, and to the cost of stepping onto each cell
+OPEN_CELLS = b" AB123456789"
+WALL_TABLE = bytes(0 if c in OPEN_CELLS else 1 for c in range(256))
+WEIGHT_TABLE = bytes(c - ord("0") if c in b"123456789" else 1 for c in range(256))
+
+
+class CellSet:
+    """Read-only set of (i, j) cells backed by a GridMaze bytearray."""
+
+    def __init__(self, maze, marks):
+        self.maze = maze
+        self.marks = marks
+
+    def __contains__(self, cell):
+        i, j = cell
+        return 0 <= i < self.maze.height and 0 <= j < self.maze.width and bool(self.marks[self.maze.index(cell)])
+
+    def __iter__(self):
+        for index, mark in enumerate(self.marks):
+            if mark:
+                yield self.maze.cell(index)
+
+    def __len__(self):
+        return sum(1 for mark in self.marks if mark)
+
+
+class GridMaze(Maze):
+    """
+    Maze stored as flat bytearrays instead of lists of lists.
+
+    The grid is padded with a border of walls and stored row by row, so cell
+    (i, j) is index (i + 1) * stride + (j + 1) and its neighbors are always
+    index + offset for a fixed set of offsets, with no bounds checks. Searches
+    run on these integer indices with bytearray seen/closed marks and an
+    array of parent indices instead of Node objects.
+
+    walls and weights are row views over the bytearrays, so print and
+    output_image keep working.
+    """
+
+    def __init__(self, filename, multiple_goals=False):
+        with open(filename, "rb") as f:
+            contents = f.read()
+
+        # Validate start and goal
+        if contents.count(b"A") != 1:
+            raise Exception("maze must have exactly one start point")
+        if contents.count(b"B") != 1 and not (multiple_goals and contents.count(b"B") > 0):
+            raise Exception("maze must have exactly one goal")
+        goals = []
+
+        lines = contents.splitlines()
+        self.height = len(lines)
+        self.width = max(len(line) for line in lines)
+        self.stride = self.width + 2
+
+        # Everything starts as wall (the border stays that way); each line is
+        # converted with one translate call instead of a loop over its cells
+        size = self.stride * (self.height + 2)
+        self.grid = bytearray(b"\x01") * size
+        self.grid_weights = bytearray(b"\x01") * size
+        for i, line in enumerate(lines):
+            base = self.index((i, 0))
+            self.grid[base:base + self.width] = line.translate(WALL_TABLE).ljust(self.width, b"\x00")
+            self.grid_weights[base:base + len(line)] = line.translate(WEIGHT_TABLE)
+            if b"A" in line:
+                self.start = (i, line.index(b"A"))
+            goals.extend((i, j) for j, c in enumerate(line) if c == ord("B"))
+
+        # Same order as Maze.neighbors, so searches visit cells in the same order
+        self.offsets = (("up", -self.stride), ("down", self.stride), ("left", -1), ("right", 1))
+
+        self.goal = goals[0]
+        self.goals = set(goals)
+        self.solution = None
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.stride + cell[1] + 1
+
+    def cell(self, index):
+        i, j = divmod(index, self.stride)
+        return (i - 1, j - 1)
+
+    @property
+    def walls(self):
+        view = memoryview(self.grid)
+        return [view[self.index((i, 0)):self.index((i, self.width))] for i in range(self.height)]
+
+    @property
+    def weights(self):
+        view = memoryview(self.grid_weights)
+        return [view[self.index((i, 0)):self.index((i, self.width))] for i in range(self.height)]
+
+    def wall_mask(self):
+        import numpy as np
+        grid = np.frombuffer(self.grid, dtype=np.uint8).reshape(self.height + 2, self.stride)
+        return grid[1:-1, 1:-1].astype(bool)
+
+    def explored_mask(self):
+        if not isinstance(self.explored, CellSet):
+            return super().explored_mask()
+        import numpy as np
+        marks = np.frombuffer(self.explored.marks, dtype=np.uint8).reshape(self.height + 2, self.stride)
+        return marks[1:-1, 1:-1].astype(bool)
+
+    def neighbors(self, state):
+        index = self.index(state)
+        return [
+            (action, self.cell(index + offset))
+            for action, offset in self.offsets
+            if not self.grid[index + offset]
+        ]
+
+    def solve(self, algorithm="dfs"):
+        """Same as Maze.solve, on flat cell indices."""
+        if algorithm not in ("dfs", "bfs", "astar", "greedy"):
+            raise ValueError(f"unknown algorithm: {algorithm}")
+        solve_start = time.perf_counter()
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+        start, goal = self.index(self.start), self.index(self.goal)
+        grid, offsets = self.grid, [offset for _, offset in self.offsets]
+        parents = array("i", [-1]) * len(grid)
+        closed = bytearray(len(grid))
+        self.num_explored = 0
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+        if algorithm in ("dfs", "bfs"):
+            # A cell is only ever added once: Maze.solve skips cells that
+            # are in the frontier or explored, i.e. every cell added before
+            seen = bytearray(len(grid))
+            seen[start] = 1
+            frontier = [start] if algorithm == "dfs" else deque([start])
+            remove = frontier.pop if algorithm == "dfs" else frontier.popleft
+            found = False
+            while frontier:
+                index = remove()
+                self.num_explored += 1
+                if index == goal:
+                    found = True
+                    break
+                closed[index] = 1
+                for offset in offsets:
+                    neighbor = index + offset
+                    if not grid[neighbor] and not seen[neighbor]:
+                        seen[neighbor] = 1
+                        parents[neighbor] = index
+                        frontier.append(neighbor)
+        else:
+            goal_i, goal_j = self.goal
+            stride = self.stride
+
+            def heuristic(index):
+                i, j = divmod(index, stride)
+                return abs(i - 1 - goal_i) + abs(j - 1 - goal_j)
+
+            # Ties break like Maze.solve_best_first's PriorityFrontier: on
+            # (priority, h), then by insertion order. Each entry carries its
+            # own parent, since the first entry removed for a cell is kept
+            weights = self.grid_weights
+            costs = {start: 0}
+            order = itertools.count()
+            frontier = [(heuristic(start), heuristic(start), next(order), start, -1, 0)]
+            found = False
+            while frontier:
+                _, _, _, index, parent, cost = heapq.heappop(frontier)
+                if closed[index]:
+                    continue
+                closed[index] = 1
+                parents[index] = parent
+                self.num_explored += 1
+                if index == goal:
+                    found = True
+                    break
+                for offset in offsets:
+                    neighbor = index + offset
+                    if grid[neighbor] or closed[neighbor]:
+                        continue
+                    new_cost = cost + weights[neighbor]
+                    if new_cost < costs.get(neighbor, new_cost + 1):
+                        costs[neighbor] = new_cost
+                        h = heuristic(neighbor)
+                        priority = h if algorithm == "greedy" else new_cost + h
+                        heapq.heappush(frontier, (priority, h, next(order), neighbor, index, new_cost))
+
+        self.explored = CellSet(self, closed)
+        if not found:
+            raise Exception("no solution")
+
+        # Follow parent indices back to the start
+        actions_by_offset = {offset: action for action, offset in self.offsets}
+        actions = []
+        cells = []
+        index = goal
+        while index != start:
+            parent = parents[index]
+            actions.append(actions_by_offset[index - parent])
+            cells.append(self.cell(index))
+            index = parent
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+        self.cost = sum(self.grid_weights[self.index(cell)] for cell in cells)
+        self.solve_time = time.perf_counter() - solve_start
+
+
+class DistanceField:
+    """
+    Breadth-first distances and parents from one source cell to every
+    reachable cell of a maze (steps, ignoring cell weights).
+
+    Built once per source, it answers any number of goal queries: distance
+    in O(1) and the path in O(path length). Built with goals, the search
+    stops at the first goal reached instead, which is the nearest one.
+    `explored` holds the cells expanded by the search, like Maze.explored.
+    """
+
+    def __init__(self, maze, source=None, goals=None):
+        self.maze = maze
+        self.source = source if source is not None else maze.start
+        self.reached = None
+        self.num_explored = 0
+        if isinstance(maze, GridMaze):
+            self._search_grid(goals)
+        else:
+            self._search_cells(goals)
+
+    def _search_grid(self, goals):
+        maze = self.maze
+        grid, offsets = maze.grid, [offset for _, offset in maze.offsets]
+        stop = {maze.index(goal) for goal in goals} if goals is not None else ()
+        start = maze.index(self.source)
+        self.distances = array("i", [-1]) * len(grid)
+        self.parents = array("i", [-1]) * len(grid)
+        self.distances[start] = 0
+        closed = bytearray(len(grid))
+        self.explored = CellSet(maze, closed)
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            self.num_explored += 1
+            if index in stop:
+                self.reached = maze.cell(index)
+                return
+            closed[index] = 1
+            distance = self.distances[index] + 1
+            for offset in offsets:
+                neighbor = index + offset
+                if not grid[neighbor] and self.distances[neighbor] < 0:
+                    self.distances[neighbor] = distance
+                    self.parents[neighbor] = index
+                    queue.append(neighbor)
+
+    def _search_cells(self, goals):
+        stop = set(goals) if goals is not None else ()
+        self.distances = {self.source: 0}
+        self.parents = {self.source: None}
+        self.explored = set()
+        queue = deque([self.source])
+        while queue:
+            cell = queue.popleft()
+            self.num_explored += 1
+            if cell in stop:
+                self.reached = cell
+                return
+            self.explored.add(cell)
+            for action, neighbor in self.maze.neighbors(cell):
+                if neighbor not in self.distances:
+                    self.distances[neighbor] = self.distances[cell] + 1
+                    self.parents[neighbor] = (action, cell)
+                    queue.append(neighbor)
+
+    def distance(self, goal):
+        """Returns the number of steps from the source to goal, or None if unreachable."""
+        if isinstance(self.maze, GridMaze):
+            i, j = goal
+            if not (0 <= i < self.maze.height and 0 <= j < self.maze.width):
+                return None
+            distance = self.distances[self.maze.index(goal)]
+            return distance if distance >= 0 else None
+        return self.distances.get(goal)
+
+    def path(self, goal):
+        """Returns (actions, cells) from the source to goal like Maze.solution, or None if unreachable."""
+        if self.distance(goal) is None:
+            return None
+        actions = []
+        cells = []
+        if isinstance(self.maze, GridMaze):
+            actions_by_offset = {offset: action for action, offset in self.maze.offsets}
+            index, start = self.maze.index(goal), self.maze.index(self.source)
+            while index != start:
+                parent = self.parents[index]
+                actions.append(actions_by_offset[index - parent])
+                cells.append(self.maze.cell(index))
+                index = parent
+        else:
+            cell = goal
+            while self.parents[cell] is not None:
+                action, parent = self.parents[cell]
+                actions.append(action)
+                cells.append(cell)
+                cell = parent
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+    def nearest(self, goals):
+        """Returns (goal, distance) for the nearest reachable goal, or None."""
+        reachable = [(self.distance(goal), goal) for goal in goals if self.distance(goal) is not None]
+        if not reachable:
+            return None
+        distance, goal = min(reachable)
+        return goal, distance
+
+
+if __name__ == "__main__":
+    # --grid loads the maze into the flat GridMaze representation
+    args = [arg for arg in sys.argv[1:] if arg != "--grid"]
+    if len(args) not in (1, 2):
+        sys.exit("Usage: python maze.py maze.txt [dfs|bfs|astar|greedy] [--grid]")
+
+    m = GridMaze(args[0]) if "--grid" in sys.argv else Maze(args[0])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(args[1] if len(args) == 2 else "dfs")
+    print("States Explored:", m.num_explored)
+    print("Path Cost:", m.cost)
+    print(f"Time: {m.solve_time * 1000:.3f} ms")
+    print("Solution:")
+    m.print()
+    if "--grid" in sys.argv:
+        m.output_image_fast("maze.png", show_explored=True)
+    else:
+        m.output_image("maze.png", show_explored=True)
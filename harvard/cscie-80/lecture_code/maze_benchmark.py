@@ -0,0 +1,79 @@
+"""
+Compare the maze search strategies on a large random maze.
+
+Usage: python maze_benchmark.py height width [wall_density] [weighted_density] [seed]
+
+Writes the random maze to maze_benchmark.txt, then loads it both as a Maze
+and as a GridMaze, reports the memory each representation holds, and solves
+it with every algorithm they support, reporting states explored, path cost
+and wall-clock time.
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+from maze import GridMaze, Maze
+
+ALGORITHMS = ("dfs", "bfs", "greedy", "astar")
+
+
+def generate(filename, height, width, wall_density, weighted_density, seed):
+    """Writes a random maze with A in the top left and B in the bottom right corner."""
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        for i in range(height):
+            row = []
+            for j in range(width):
+                if (i, j) == (0, 0):
+                    row.append("A")
+                elif (i, j) == (height - 1, width - 1):
+                    row.append("B")
+                elif rng.random() < wall_density:
+                    row.append("#")
+                elif rng.random() < weighted_density:
+                    row.append(str(rng.randint(2, 9)))
+                else:
+                    row.append(" ")
+            f.write("".join(row) + "\n")
+
+
+def main():
+    if not 3 <= len(sys.argv) <= 6:
+        sys.exit("Usage: python maze_benchmark.py height width [wall_density] [weighted_density] [seed]")
+    height, width = int(sys.argv[1]), int(sys.argv[2])
+    wall_density = float(sys.argv[3]) if len(sys.argv) > 3 else 0.25
+    weighted_density = float(sys.argv[4]) if len(sys.argv) > 4 else 0.2
+    seed = int(sys.argv[5]) if len(sys.argv) > 5 else 0
+
+    generate("maze_benchmark.txt", height, width, wall_density, weighted_density, seed)
+
+    for representation in (Maze, GridMaze):
+        tracemalloc.start()
+        start = time.perf_counter()
+        maze = representation("maze_benchmark.txt")
+        load_time = time.perf_counter() - start
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{representation.__name__}: loaded in {load_time * 1000:.1f} ms, "
+              f"{memory / 2 ** 20:.1f} MB")
+
+        print(f"{'algorithm':<10}{'explored':>12}{'length':>10}{'cost':>10}{'time (ms)':>12}")
+        for algorithm in ALGORITHMS:
+            try:
+                # solve() prints the whole solution; keep it out of the table
+                with contextlib.redirect_stdout(io.StringIO()):
+                    maze.solve(algorithm)
+            except Exception as e:
+                print(f"{algorithm:<10}{str(e):>12}")
+                continue
+            print(f"{algorithm:<10}{maze.num_explored:>12}{len(maze.solution[1]):>10}"
+                  f"{maze.cost:>10}{maze.solve_time * 1000:>12.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import pytest
+
+from maze import GridMaze, Maze
+from maze_benchmark import generate
+
+MAZE = """\
+##########
+#A   #   #
+# ## # # #
+#  #   #B#
+## ##### #
+#B       #
+##########
+"""
+
+
+@pytest.fixture
+def maze_file(tmp_path):
+    filename = tmp_path / "maze.txt"
+    filename.write_text(MAZE)
+    return str(filename)
+
+
+@pytest.mark.parametrize("cls", [Maze, GridMaze])
+def test_solve_nearest_then_render(cls, maze_file, tmp_path):
+    m = cls(maze_file, multiple_goals=True)
+    assert m.goals == {(3, 8), (5, 1)}
+
+    goal = m.solve_nearest()
+    assert goal == (5, 1)
+    assert m.solution[1][-1] == goal
+    assert m.solve_time >= 0
+    assert m.start in m.explored
+    assert goal not in m.explored
+    assert len(m.explored) == m.num_explored - 1
+
+    # Rendering the explored cells needs explored to be set
+    m.output_image(str(tmp_path / "slow.png"), show_explored=True)
+    m.output_image_fast(str(tmp_path / "fast.png"), show_explored=True, cell_size=10, cell_border=1)
+    assert (tmp_path / "slow.png").exists()
+    assert (tmp_path / "fast.png").exists()
+
+
+def test_explored_matches_between_representations(maze_file):
+    m = Maze(maze_file, multiple_goals=True)
+    g = GridMaze(maze_file, multiple_goals=True)
+    m.solve_nearest()
+    g.solve_nearest()
+    assert set(m.explored) == set(g.explored)
+
+
+# Seeds whose random maze has a path from A to B
+@pytest.mark.parametrize("algorithm", ["astar", "greedy"])
+@pytest.mark.parametrize("seed", [0, 1, 2, 6, 7, 8])
+def test_best_first_matches_between_representations(algorithm, seed, tmp_path):
+    filename = str(tmp_path / "random.txt")
+    generate(filename, 30, 40, 0.25, 0.2, seed)
+    m = Maze(filename)
+    g = GridMaze(filename)
+    m.solve(algorithm)
+    g.solve(algorithm)
+    assert g.solution == m.solution
+    assert g.num_explored == m.num_explored
+    assert g.cost == m.cost
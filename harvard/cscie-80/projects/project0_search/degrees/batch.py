@@ -0,0 +1,166 @@
+"""
+Batch mode for degrees.py
+
+Usage: python batch.py queries.csv [directory] [--workers=N]
+
+queries.csv holds one "source,target" pair per row (an optional
+"source,target" header row is skipped). Each value is a person_id or a
+name; names must be unambiguous since nobody is there to answer input().
+
+Queries are grouped by source, and one breadth-first search from each
+source answers every target in its group. With --workers=N the groups
+are spread over a pool of N processes. Results are streamed to stdout
+as JSON lines, in the order the groups finish:
+
+    {"query": 0, "source": "102", "target": "158", "degrees": 1, "path": [["104257", "158"]]}
+"""
+
+import csv
+import json
+import sys
+from collections import deque
+from multiprocessing import Pool
+
+import degrees
+from util import path_to
+
+
+def read_queries(filename):
+    """
+    Returns the list of (source, target) pairs in filename.
+    """
+    queries = []
+    with open(filename, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or row == ["source", "target"]:
+                continue
+            if len(row) != 2:
+                raise ValueError(f"expected 'source,target', got {row}")
+            queries.append((row[0].strip(), row[1].strip()))
+    return queries
+
+
+def resolve(value):
+    """
+    Returns (person_id, error) for a person_id or an unambiguous name.
+    """
+    if value in degrees.people:
+        return value, None
+    person_ids = degrees.names.get(value.lower(), set())
+    if len(person_ids) == 1:
+        return next(iter(person_ids)), None
+    if len(person_ids) > 1:
+        return None, f"ambiguous name: {value}"
+    return None, f"person not found: {value}"
+
+
+def group_queries(queries):
+    """
+    Groups queries by resolved source.
+    Returns ({source: [(query number, target value)]}, results for queries
+    that could not be resolved).
+    """
+    groups = {}
+    failed = []
+    for number, (source_value, target_value) in enumerate(queries):
+        source, error = resolve(source_value)
+        if error:
+            failed.append({"query": number, "source": source_value, "target": target_value, "error": error})
+            continue
+        groups.setdefault(source, []).append((number, target_value))
+    return groups, failed
+
+
+def bfs_tree(source, targets):
+    """
+    Runs one breadth-first search from source, stopping as soon as every
+    person in targets has been reached.
+    Returns a dict mapping each reached person to the (movie_id, person_id)
+    step that reached them (None for the source).
+    """
+    parents = {source: None}
+    remaining = set(targets) - {source}
+    queue = deque([source])
+    while queue and remaining:
+        person_id = queue.popleft()
+        for movie_id, neighbor in degrees.neighbors_for_person(person_id):
+            if neighbor not in parents:
+                parents[neighbor] = (movie_id, person_id)
+                remaining.discard(neighbor)
+                queue.append(neighbor)
+    return parents
+
+
+def answer_group(group):
+    """
+    Answers every query in a (source, [(query number, target value)]) group.
+    Returns the list of JSON-ready results.
+    """
+    source, queries = group
+    resolved = [(number, target_value) + resolve(target_value) for number, target_value in queries]
+    parents = bfs_tree(source, [target for _, _, target, _ in resolved if target is not None])
+
+    results = []
+    for number, target_value, target, error in resolved:
+        result = {"query": number, "source": source, "target": target or target_value}
+        if error:
+            result["error"] = error
+        else:
+            path = path_to(parents, target)
+            result["degrees"] = len(path) if path is not None else None
+            result["path"] = path
+        results.append(result)
+    return results
+
+
+def load_worker(directory):
+    """
+    Pool initializer: forked workers inherit the loaded data, spawned ones
+    have to load it themselves.
+    """
+    if not degrees.people:
+        degrees.load_data(directory)
+
+
+def run(queries, directory, workers=1, output=sys.stdout):
+    """
+    Answers queries and writes one JSON line per query to output.
+    """
+    groups, failed = group_queries(queries)
+    for result in failed:
+        print(json.dumps(result), file=output)
+
+    if workers > 1:
+        with Pool(workers, initializer=load_worker, initargs=(directory,)) as pool:
+            for results in pool.imap_unordered(answer_group, groups.items()):
+                for result in results:
+                    print(json.dumps(result), file=output)
+    else:
+        for group in groups.items():
+            for result in answer_group(group):
+                print(json.dumps(result), file=output)
+
+
+def main():
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    workers = 1
+    for option in options:
+        if option.startswith("--workers=") and option[len("--workers="):].isdigit():
+            workers = int(option[len("--workers="):])
+        else:
+            args = []
+    if not 1 <= len(args) <= 2:
+        sys.exit("Usage: python batch.py queries.csv [directory] [--workers=N]")
+    directory = args[1] if len(args) == 2 else "large"
+
+    queries = read_queries(args[0])
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory)
+    print("Data loaded.", file=sys.stderr)
+
+    run(queries, directory, workers=workers)
+
+
+if __name__ == "__main__":
+    main()
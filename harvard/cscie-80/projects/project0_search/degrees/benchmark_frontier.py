@@ -0,0 +1,77 @@
+"""
+Compare the original list-backed frontiers in util.py against the
+hash-assisted ones (FastStackFrontier, FastQueueFrontier, PriorityFrontier).
+
+Usage: python benchmark_frontier.py [max_exponent] [ops]
+
+For every size n = 10^3 .. 10^max_exponent the frontier is filled with n
+nodes and then `ops` contains_state misses and `ops` removes are timed.
+Results are reported per operation, because the original classes are
+O(n) per contains_state/remove and would take hours to drain 10^6 nodes.
+"""
+
+import sys
+import time
+
+from util import Node, StackFrontier, QueueFrontier, FastStackFrontier, FastQueueFrontier, PriorityFrontier
+
+
+def fill(frontier, n):
+    """
+    Adds n nodes with distinct integer states to the frontier.
+    Returns the elapsed seconds.
+    """
+    start = time.perf_counter()
+    for i in range(n):
+        frontier.add(Node(state=i, parent=None, action=None))
+    return time.perf_counter() - start
+
+
+def time_ops(frontier, n, ops):
+    """
+    Times `ops` contains_state calls (for states not in the frontier, which is
+    the worst case for a linear scan) followed by `ops` removes.
+    Returns the average seconds per contains_state and per remove.
+    """
+    ops = min(ops, n)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        frontier.contains_state(n + i)
+    contains = (time.perf_counter() - start) / ops
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        frontier.remove()
+    remove = (time.perf_counter() - start) / ops
+
+    return contains, remove
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_frontier.py [max_exponent] [ops]")
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    frontiers = [
+        ("StackFrontier", StackFrontier),
+        ("FastStackFrontier", FastStackFrontier),
+        ("QueueFrontier", QueueFrontier),
+        ("FastQueueFrontier", FastQueueFrontier),
+        ("PriorityFrontier", lambda: PriorityFrontier(lambda node: -node.state)),
+    ]
+
+    print(f"{'frontier':<20}{'n':>10}{'add (us)':>12}{'contains (us)':>16}{'remove (us)':>14}")
+    for exponent in range(3, max_exponent + 1):
+        n = 10 ** exponent
+        for name, factory in frontiers:
+            frontier = factory()
+            add = fill(frontier, n) / n
+            contains, remove = time_ops(frontier, n, ops)
+            print(f"{name:<20}{n:>10}{add * 1e6:>12.3f}{contains * 1e6:>16.3f}{remove * 1e6:>14.3f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare memory and query latency of the dict backend in degrees.py against
+the CSR backend in graph.py.
+
+Usage: python benchmark_graph.py [directory] [queries]
+
+Memory is measured with tracemalloc while each backend loads the CSV files.
+Latency is measured over the same random (source, target) pairs, and the
+path lengths of both backends are checked against each other.
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+import degrees
+from graph import CSRGraph
+
+
+def measure(function, *args):
+    """
+    Calls function(*args) and returns (result, seconds, bytes still allocated).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_graph.py [directory] [queries]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    _, dict_load, dict_memory = measure(degrees.load_data, directory)
+    graph, csr_load, csr_memory = measure(CSRGraph.load, directory)
+
+    print(f"{'backend':<8}{'load (s)':>12}{'memory (MB)':>14}")
+    print(f"{'dict':<8}{dict_load:>12.3f}{dict_memory / 2 ** 20:>14.1f}")
+    print(f"{'csr':<8}{csr_load:>12.3f}{csr_memory / 2 ** 20:>14.1f}")
+    print(f"CSR adjacency arrays: {graph.nbytes() / 2 ** 20:.1f} MB")
+    print()
+
+    random.seed(0)
+    person_ids = list(degrees.people)
+    pairs = [(random.choice(person_ids), random.choice(person_ids)) for _ in range(queries)]
+
+    timings = {"dict": 0.0, "csr": 0.0}
+    for source, target in pairs:
+        # shortest_path prints progress messages; keep them out of the report
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = degrees.shortest_path(source, target)
+        timings["dict"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        path = graph.shortest_path(source, target)
+        timings["csr"] += time.perf_counter() - start
+
+        if (path is None) != (expected is None) or (path is not None and len(path) != len(expected)):
+            sys.exit(f"Backends disagree for {source} -> {target}: {expected} vs {path}")
+
+    print(f"{'backend':<8}{'mean query (ms)':>18}")
+    for backend, total in timings.items():
+        print(f"{backend:<8}{total / queries * 1000:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+LRU path cache for degrees.py
+
+PathCache memoizes shortest paths keyed on (source, target) and also keeps
+the breadth-first search tree grown from each recent source. A later query
+from the same source is answered straight from that tree if the target has
+already been reached, or by resuming the search where it stopped. Both
+levels are bounded with least-recently-used eviction, and the whole cache
+can be pickled to disk between runs.
+"""
+
+import os
+import pickle
+from collections import OrderedDict, deque
+
+from util import csv_signature, path_to
+
+CACHE_VERSION = 1
+
+CACHE_FILE = ".degrees-cache.pickle"
+
+
+class SearchTree():
+    """
+    A resumable breadth-first search from one source.
+    `parents` maps each reached person to the (movie_id, person_id) step
+    that reached them; `queue` holds the people still to be expanded.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.parents = {source: None}
+        self.queue = deque([source])
+
+    def reach(self, target, neighbors_for_person):
+        """
+        Expands the search until target is reached or nothing is left.
+        Returns the shortest path to target, or None if not connected.
+        """
+        while target not in self.parents and self.queue:
+            person_id = self.queue.popleft()
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor not in self.parents:
+                    self.parents[neighbor] = (movie_id, person_id)
+                    self.queue.append(neighbor)
+        return path_to(self.parents, target)
+
+
+class PathCache():
+
+    def __init__(self, neighbors_for_person, maxsize=1024, max_trees=16):
+        self.neighbors_for_person = neighbors_for_person
+        self.maxsize = maxsize
+        self.max_trees = max_trees
+        self.paths = OrderedDict()
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.tree_hits = 0
+        self.misses = 0
+
+    def shortest_path(self, source, target):
+        """
+        Same contract as degrees.shortest_path, answered from the cache
+        whenever possible.
+        """
+        key = (source, target)
+        if key in self.paths:
+            self.hits += 1
+            self.paths.move_to_end(key)
+            return self.paths[key]
+
+        tree = self.trees.get(source)
+        if tree is not None and (target in tree.parents or not tree.queue):
+            self.tree_hits += 1
+        else:
+            self.misses += 1
+            if tree is None:
+                tree = SearchTree(source)
+        path = tree.reach(target, self.neighbors_for_person)
+
+        self._store(self.trees, source, tree, self.max_trees)
+        self._store(self.paths, key, path, self.maxsize)
+        return path
+
+    @staticmethod
+    def _store(entries, key, value, maxsize):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > maxsize:
+            entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and current cache sizes.
+        """
+        return {
+            "hits": self.hits,
+            "tree_hits": self.tree_hits,
+            "misses": self.misses,
+            "paths": len(self.paths),
+            "trees": len(self.trees),
+        }
+
+    def save(self, filename, directory):
+        """
+        Pickles the cached paths and trees for the data in directory.
+        """
+        state = {
+            "version": CACHE_VERSION,
+            "csv": csv_signature(directory),
+            "paths": self.paths,
+            "trees": self.trees,
+        }
+        with open(filename + ".tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filename + ".tmp", filename)
+
+    def load(self, filename, directory):
+        """
+        Loads paths and trees saved by save(), unless the file is missing or
+        was saved for different CSV files.
+        Returns True if anything was loaded.
+        """
+        try:
+            with open(filename, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        if state.get("version") != CACHE_VERSION or state.get("csv") != csv_signature(directory):
+            return False
+        for key, path in state["paths"].items():
+            self._store(self.paths, key, path, self.maxsize)
+        for source, tree in state["trees"].items():
+            self._store(self.trees, source, tree, self.max_trees)
+        return True
@@ -1,7 +1,8 @@
 import csv
+import os
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from util import Node, StackFrontier, QueueFrontier, FastQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,6 +13,9 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Optional name_index.NameIndex over people, built by main() with --index
+name_index = None
+
 
 def load_data(directory):
     """
@@ -53,23 +57,83 @@ def load_data(directory):
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
-
-    # Load data from files into memory
-    print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
-
-    source = person_id_for_name(input("Name: "))
+    global names, people, movies, name_index
+
+    # Options start with "--", anything else is the data directory
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    known = ("--bidirectional", "--csr", "--snapshot", "--cache", "--chunked", "--parallel", "--index")
+    if len(args) > 1 or any(option not in known for option in options):
+        sys.exit("Usage: python degrees.py [--bidirectional | --csr] [--snapshot] [--cache] "
+                 "[--chunked | --parallel] [--index] [directory]\n"
+                 "--bidirectional can't be combined with --csr or --cache")
+    directory = args[0] if len(args) == 1 else "large"
+    bidirectional = "--bidirectional" in options
+    if bidirectional and "--csr" in options:
+        sys.exit("--bidirectional is not supported with --csr")
+    # The cache resumes one-directional search trees, so it can't honor it
+    if bidirectional and "--cache" in options:
+        sys.exit("--bidirectional is not supported with --cache")
+
+    # With --snapshot, reuse the memory-mapped snapshot of a previous run if
+    # the CSV files haven't changed since
+    graph = None
+    snapshot = None
+    if "--snapshot" in options:
+        from snapshot import load_snapshot, write_snapshot
+        snapshot = load_snapshot(directory)
+
+    if snapshot is not None:
+        # The views search like the dicts; the snapshot's CSR arrays are
+        # only searched with --csr, as they would be after a CSV load
+        names, people, movies = snapshot.names, snapshot.people, snapshot.movies
+        if "--csr" in options:
+            graph = snapshot.graph
+        print("Data loaded from snapshot.")
+    else:
+        # Load data from files into memory
+        print("Loading data...")
+        if "--chunked" in options or "--parallel" in options:
+            import ingest
+            report = ingest.load_data(directory, names, people, movies, parallel="--parallel" in options)
+            ingest.print_report(report)
+        else:
+            load_data(directory)
+        print("Data loaded.")
+        if "--snapshot" in options:
+            write_snapshot(directory, people, movies)
+
+    # Optionally search on the compact integer-indexed graph instead
+    if "--csr" in options and graph is None:
+        from graph import CSRGraph
+        graph = CSRGraph.from_data(people, movies)
+
+    if "--index" in options:
+        from name_index import NameIndex
+        name_index = NameIndex(people)
+
+    name = input("Name: ")
+    source = person_id_for_name(name)
     if source is None:
-        sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
+        sys.exit(person_not_found(name))
+    name = input("Name: ")
+    target = person_id_for_name(name)
     if target is None:
-        sys.exit("Person not found.")
-
-    path = shortest_path(source, target)
+        sys.exit(person_not_found(name))
+
+    if "--cache" in options:
+        # Answer through the on-disk path cache shared by previous runs
+        from cache import CACHE_FILE, PathCache
+        cache = PathCache(graph.neighbors_for_person if graph is not None else neighbors_for_person)
+        cache_file = os.path.join(directory, CACHE_FILE)
+        cache.load(cache_file, directory)
+        path = cache.shortest_path(source, target)
+        cache.save(cache_file, directory)
+        print(f"Cache: {cache.stats()}")
+    elif graph is not None:
+        path = graph.shortest_path(source, target)
+    else:
+        path = shortest_path(source, target, bidirectional=bidirectional)
 
     if path is None:
         print("Not connected.")
@@ -84,13 +148,18 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    With bidirectional=True the search grows from both ends
+    (see bidirectional_shortest_path).
     """
+    if bidirectional:
+        return bidirectional_shortest_path(source, target)
 
     # TODO
     print("Loaded Data")
@@ -99,7 +168,7 @@ def shortest_path(source, target):
 
     # We will use QueueFronteir as it implemets breadth-first search which is guranteed to find the optimal solution for a search problem
 
-    qf = QueueFrontier()  # Initialize a Queue Frontier
+    qf = FastQueueFrontier()  # Initialize a Queue Frontier (deque + state lookup, same order as QueueFrontier)
 
     # In our search problem, nodes (vertices) will be the actors (stars) and the edges (links) will be movies.
     # We have to start from source (first actor), use the movies as 'actions' to get to other actors. The second actor is the target.
@@ -157,12 +226,90 @@ def shortest_path(source, target):
     # raise NotImplementedError
 
 
-def person_id_for_name(name):
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the same result as shortest_path, but searches breadth-first from
+    the source and the target at the same time, always expanding one whole
+    level of whichever frontier is smaller, until the two searches meet.
+
+    Since the searches only meet when a newly reached person has already been
+    reached from the other side, the first meeting point gives a shortest path.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) step that reached
+    # them: the previous person for the source side, the next person towards
+    # the target for the target side
+    source_parents = {source: None}
+    target_parents = {target: None}
+    source_frontier = [source]
+    target_frontier = [target]
+
+    while source_frontier and target_frontier:
+        # Expand the cheaper side
+        if len(source_frontier) <= len(target_frontier):
+            frontier, parents, other_parents = source_frontier, source_parents, target_parents
+        else:
+            frontier, parents, other_parents = target_frontier, target_parents, source_parents
+
+        next_frontier = []
+        for person_id in frontier:
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (movie_id, person_id)
+                if neighbor in other_parents:
+                    return join_paths(neighbor, source_parents, target_parents)
+                next_frontier.append(neighbor)
+
+        if parents is source_parents:
+            source_frontier = next_frontier
+        else:
+            target_frontier = next_frontier
+
+    return None
+
+
+def join_paths(meeting, source_parents, target_parents):
+    """
+    Splices the two parent chains of a bidirectional search that met at
+    `meeting` into a list of (movie_id, person_id) pairs from source to target.
+    """
+    # Walk back from the meeting point to the source
+    path = []
+    person_id = meeting
+    while source_parents[person_id] is not None:
+        movie_id, previous = source_parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = previous
+    path.reverse()
+
+    # Walk forward from the meeting point to the target
+    person_id = meeting
+    while target_parents[person_id] is not None:
+        movie_id, following = target_parents[person_id]
+        path.append((movie_id, following))
+        person_id = following
+    return path
+
+
+def person_id_for_name(name, birth=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    If birth is given, only people born that year are considered and
+    the user is never asked: None is returned if that still leaves
+    more than one person.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    if name_index is not None:
+        person_ids = name_index.exact(name)
+    else:
+        person_ids = list(names.get(name.lower(), set()))
+    if birth is not None:
+        person_ids = [person_id for person_id in person_ids if people[person_id]["birth"] == str(birth)]
+        return person_ids[0] if len(person_ids) == 1 else None
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
@@ -183,6 +330,22 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def person_not_found(name):
+    """
+    Returns the "Person not found." message, with the closest names
+    when a name index is available.
+    """
+    if name_index is None:
+        return "Person not found."
+    # People sharing a name are listed once, in order of closeness
+    suggestions = list(dict.fromkeys(
+        people[person_id]["name"] for person_id, _ in name_index.fuzzy(name, k=3)
+    ))
+    if not suggestions:
+        return "Person not found."
+    return f"Person not found. Did you mean: {', '.join(suggestions)}?"
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
@@ -0,0 +1,221 @@
+"""
+Compact graph backend for degrees.py
+
+The dict backend in degrees.py keeps a dict per person and per movie, each
+holding a Python set of string IDs. Here the IMDb IDs are interned to dense
+ints and the bipartite star graph is stored as two CSR (compressed sparse row)
+adjacency arrays:
+
+    person_movies[person_offsets[p]:person_offsets[p + 1]]  movies person p starred in
+    movie_people[movie_offsets[m]:movie_offsets[m + 1]]     people who starred in movie m
+
+Breadth-first search runs one whole level at a time with NumPy, so no Python
+objects are created per neighbor.
+"""
+
+import csv
+
+import numpy as np
+
+
+class CSRGraph():
+
+    def __init__(self, person_ids, movie_ids, person_offsets, person_movies, movie_offsets, movie_people,
+                 person_index=None, movie_index=None):
+        # Index -> IMDb id, and the reverse lookup (built here unless the
+        # caller already has one, e.g. a memory-mapped snapshot)
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        if person_index is None:
+            person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        if movie_index is None:
+            movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        self.person_index = person_index
+        self.movie_index = movie_index
+
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+
+    @classmethod
+    def from_edges(cls, person_ids, movie_ids, edge_people, edge_movies):
+        """
+        Builds the graph from parallel arrays of (person index, movie index)
+        star edges. Duplicate edges are dropped.
+        """
+        num_people = len(person_ids)
+        num_movies = len(movie_ids)
+        edge_people = np.asarray(edge_people, dtype=np.int64)
+        edge_movies = np.asarray(edge_movies, dtype=np.int64)
+
+        # Deduplicate (the dict backend stores edges in sets) and sort by person
+        keys = np.unique(edge_people * num_movies + edge_movies)
+        edge_people = (keys // max(num_movies, 1)).astype(np.int32)
+        edge_movies = (keys % max(num_movies, 1)).astype(np.int32)
+
+        person_offsets, person_movies = _csr(edge_people, edge_movies, num_people)
+        movie_offsets, movie_people = _csr(edge_movies, edge_people, num_movies)
+        return cls(person_ids, movie_ids, person_offsets, person_movies, movie_offsets, movie_people)
+
+    @classmethod
+    def from_data(cls, people, movies):
+        """
+        Builds the graph from the `people` and `movies` dicts of degrees.py.
+        """
+        person_ids = list(people)
+        movie_ids = list(movies)
+        person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        edge_people = []
+        edge_movies = []
+        for person_id, person in people.items():
+            for movie_id in person["movies"]:
+                edge_people.append(person_index[person_id])
+                edge_movies.append(movie_index[movie_id])
+        return cls.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Builds the graph straight from the CSV files, without the dict backend.
+        Rows of stars.csv that refer to unknown people or movies are skipped,
+        like load_data does.
+        """
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            person_ids = [row["id"] for row in csv.DictReader(f)]
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            movie_ids = [row["id"] for row in csv.DictReader(f)]
+
+        person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        edge_people = []
+        edge_movies = []
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                person = person_index.get(row["person_id"])
+                movie = movie_index.get(row["movie_id"])
+                if person is not None and movie is not None:
+                    edge_people.append(person)
+                    edge_movies.append(movie)
+        return cls.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+    def nbytes(self):
+        """
+        Returns the number of bytes held by the adjacency arrays.
+        """
+        return (self.person_offsets.nbytes + self.person_movies.nbytes
+                + self.movie_offsets.nbytes + self.movie_people.nbytes)
+
+    def movies_for(self, person):
+        """
+        Returns the movie indices for a person index (a view, not a copy).
+        """
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_for(self, movie):
+        """
+        Returns the person indices for a movie index (a view, not a copy).
+        """
+        return self.movie_people[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_for(self.person_index[person_id]):
+            for person in self.stars_for(movie):
+                neighbors.add((self.movie_ids[movie], self.person_ids[person]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        path = self.shortest_path_indices(self.person_index[source], self.person_index[target])
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person]) for movie, person in path]
+
+    def shortest_path_indices(self, source, target):
+        """
+        Same as shortest_path, but takes and returns integer indices.
+        """
+        if source == target:
+            return []
+
+        # person_parent[p] is the movie that reached p, movie_parent[m] the
+        # person that reached m; -1 means not reached yet
+        person_parent = np.full(len(self.person_offsets) - 1, -1, dtype=np.int32)
+        movie_parent = np.full(len(self.movie_offsets) - 1, -1, dtype=np.int32)
+        person_seen = np.zeros(len(person_parent), dtype=bool)
+        movie_seen = np.zeros(len(movie_parent), dtype=bool)
+        person_seen[source] = True
+
+        frontier = np.array([source], dtype=np.int32)
+        while len(frontier) and not person_seen[target]:
+            # People -> movies not expanded yet
+            people, movies = _expand(self.person_offsets, self.person_movies, frontier)
+            people, movies = _first_visits(people, movies, movie_seen)
+            movie_seen[movies] = True
+            movie_parent[movies] = people
+
+            # Movies -> people not reached yet
+            movies, people = _expand(self.movie_offsets, self.movie_people, movies)
+            movies, people = _first_visits(movies, people, person_seen)
+            person_seen[people] = True
+            person_parent[people] = movies
+            frontier = people
+
+        if not person_seen[target]:
+            return None
+
+        path = []
+        person = target
+        while person != source:
+            movie = int(person_parent[person])
+            path.append((movie, int(person)))
+            person = movie_parent[movie]
+        path.reverse()
+        return path
+
+
+def _csr(rows, columns, num_rows):
+    """
+    Groups edges by row and returns (offsets, indices) for them.
+    """
+    order = np.argsort(rows, kind="stable")
+    offsets = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=offsets[1:])
+    return offsets, columns[order].astype(np.int32)
+
+
+def _expand(offsets, indices, nodes):
+    """
+    Returns parallel arrays (origin, neighbor) for every neighbor of every
+    node in `nodes`, without a Python loop.
+    """
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    origins = np.repeat(nodes, counts)
+    # Position of each neighbor = start of its row + its rank within the row
+    group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + (np.arange(total) - group_starts)
+    return origins, indices[positions]
+
+
+def _first_visits(origins, neighbors, seen):
+    """
+    Keeps only neighbors not yet seen, each one once (reached from the first
+    origin that found it).
+    """
+    new = ~seen[neighbors]
+    origins, neighbors = origins[new], neighbors[new]
+    neighbors, first = np.unique(neighbors, return_index=True)
+    return origins[first], neighbors
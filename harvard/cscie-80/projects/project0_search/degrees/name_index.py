@@ -0,0 +1,127 @@
+"""
+Name index for degrees.py
+
+Built once after the data is loaded, NameIndex answers
+
+    exact(name)             every person_id with that name (case-insensitive)
+    prefix(text)            every person_id whose name starts with text
+    fuzzy(name, k)          the k closest names, for typos and partial names
+    resolve(name, birth)    one person_id without asking, using the birth year
+                            to tell people with the same name apart
+
+Exact and prefix lookups are binary searches over one sorted list of
+lowercase names. Fuzzy lookups count shared trigrams through an inverted
+index and rerank the best candidates with difflib.
+"""
+
+import bisect
+import difflib
+from collections import Counter
+
+
+def trigrams(name):
+    """
+    Returns the set of 3-character substrings of a padded lowercase name.
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex():
+
+    def __init__(self, people, fuzzy=True):
+        # Sorted (lowercase name, person_id) pairs, stored as parallel lists
+        entries = sorted((person["name"].lower(), person_id) for person_id, person in people.items())
+        self.keys = [key for key, _ in entries]
+        self.person_ids = [person_id for _, person_id in entries]
+        self.people = people
+
+        # Distinct names, and the first entry of each in keys/person_ids
+        self.names = []
+        self.starts = []
+        for i, key in enumerate(self.keys):
+            if not self.names or self.names[-1] != key:
+                self.names.append(key)
+                self.starts.append(i)
+        self.starts.append(len(self.keys))
+
+        # Inverted index: trigram -> indices into self.names
+        self.postings = None
+        if fuzzy:
+            self.postings = {}
+            for n, name in enumerate(self.names):
+                for trigram in trigrams(name):
+                    self.postings.setdefault(trigram, []).append(n)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def exact(self, name):
+        """
+        Returns the list of person_ids with this name.
+        """
+        key = name.lower()
+        low = bisect.bisect_left(self.keys, key)
+        high = bisect.bisect_right(self.keys, key, lo=low)
+        return self.person_ids[low:high]
+
+    def prefix(self, text, limit=None):
+        """
+        Returns the person_ids whose name starts with text, in name order.
+        """
+        key = text.lower()
+        low = bisect.bisect_left(self.keys, key)
+        # Every name starting with key sorts below key followed by the
+        # largest code point
+        high = bisect.bisect_left(self.keys, key + "\U0010ffff", lo=low)
+        if limit is not None:
+            high = min(high, low + limit)
+        return self.person_ids[low:high]
+
+    def fuzzy(self, name, k=5, candidates=50, budget=20000):
+        """
+        Returns up to k (person_id, score) pairs for the names closest to
+        name, best first. Scores are difflib ratios between 0 and 1.
+        """
+        if self.postings is None:
+            raise Exception("index was built without fuzzy=True")
+        key = name.lower()
+
+        # Names sharing the most trigrams with the query are the candidates.
+        # Rare trigrams say the most about a name, so count the rarest first
+        # and stop once `budget` postings have been counted (common ones
+        # like "an " can list a large part of all names).
+        lists = sorted((self.postings.get(trigram, ()) for trigram in trigrams(key)), key=len)
+        shared = Counter()
+        counted = 0
+        for i, postings in enumerate(lists):
+            if i >= 3 and counted + len(postings) > budget:
+                break
+            shared.update(postings)
+            counted += len(postings)
+
+        scored = []
+        for n, _ in shared.most_common(candidates):
+            score = difflib.SequenceMatcher(None, key, self.names[n]).ratio()
+            scored.append((score, n))
+        scored.sort(key=lambda pair: -pair[0])
+
+        matches = []
+        for score, n in scored:
+            for person_id in self.person_ids[self.starts[n]:self.starts[n + 1]]:
+                matches.append((person_id, score))
+        return matches[:k]
+
+    def resolve(self, name, birth=None):
+        """
+        Returns the person_id for name, or None if there is no such person
+        or the name is still ambiguous. If birth is given, only people born
+        that year are considered.
+        """
+        person_ids = self.exact(name)
+        if birth is not None:
+            person_ids = [
+                person_id for person_id in person_ids
+                if self.people[person_id]["birth"] == str(birth)
+            ]
+        return person_ids[0] if len(person_ids) == 1 else None
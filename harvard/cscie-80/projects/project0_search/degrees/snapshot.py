@@ -0,0 +1,280 @@
+"""
+Binary snapshot cache for degrees.py
+
+After the CSV files have been parsed once, the graph and the people/movie
+attributes are written next to them as plain .npy arrays:
+
+    the CSR adjacency arrays of graph.CSRGraph
+    string columns (IDs, names, births, titles, years) as one UTF-8 blob
+    plus an offsets array, and a sort order for lookups
+
+On the next start the arrays are memory-mapped back in, so nothing is parsed
+or decoded until a query actually touches it. A manifest records the size and
+modification time of each CSV file, and the snapshot is ignored as soon as
+any of them changes.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+from graph import CSRGraph
+from util import csv_signature
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_DIRECTORY = ".degrees-snapshot"
+
+GRAPH_ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_people")
+
+# Name of each string column, and whether lookups on it ignore case
+STRING_COLUMNS = {
+    "person_ids": False,
+    "person_names": True,
+    "person_births": False,
+    "movie_ids": False,
+    "movie_titles": False,
+    "movie_years": False,
+}
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, SNAPSHOT_DIRECTORY)
+
+
+def write_snapshot(directory, people, movies, path=None):
+    """
+    Writes a snapshot of the `people` and `movies` dicts loaded from
+    directory. The manifest is written last, so an interrupted write
+    leaves no valid snapshot behind.
+    """
+    path = path or snapshot_path(directory)
+    os.makedirs(path, exist_ok=True)
+    manifest_file = os.path.join(path, "manifest.json")
+    if os.path.exists(manifest_file):
+        os.remove(manifest_file)
+
+    graph = CSRGraph.from_data(people, movies)
+    for name in GRAPH_ARRAYS:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(graph, name))
+
+    columns = {
+        "person_ids": graph.person_ids,
+        "person_names": [people[person_id]["name"] for person_id in graph.person_ids],
+        "person_births": [people[person_id]["birth"] for person_id in graph.person_ids],
+        "movie_ids": graph.movie_ids,
+        "movie_titles": [movies[movie_id]["title"] for movie_id in graph.movie_ids],
+        "movie_years": [movies[movie_id]["year"] for movie_id in graph.movie_ids],
+    }
+    for name, ignore_case in STRING_COLUMNS.items():
+        StringTable.write(os.path.join(path, name), columns[name], ignore_case)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "csv": csv_signature(directory),
+    }
+    with open(manifest_file + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+
+def load_snapshot(directory, path=None):
+    """
+    Memory-maps the snapshot for directory.
+    Returns None if there is no snapshot or it no longer matches the CSV files.
+    """
+    path = path or snapshot_path(directory)
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("csv") != csv_signature(directory):
+            return None
+        return Snapshot(path)
+    except (OSError, ValueError):
+        return None
+
+
+class StringTable():
+    """
+    Read-only list of strings stored as a UTF-8 blob and an offsets array,
+    with a sort order so equal strings can be found by binary search.
+    """
+
+    def __init__(self, prefix, ignore_case):
+        self.blob = np.load(f"{prefix}.blob.npy", mmap_mode="r")
+        self.offsets = np.load(f"{prefix}.offsets.npy", mmap_mode="r")
+        self.order = np.load(f"{prefix}.order.npy", mmap_mode="r")
+        self.ignore_case = ignore_case
+
+    @classmethod
+    def write(cls, prefix, strings, ignore_case):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        keys = [s.lower() for s in strings] if ignore_case else strings
+        order = np.array(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int32)
+        np.save(f"{prefix}.blob.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        np.save(f"{prefix}.offsets.npy", offsets)
+        np.save(f"{prefix}.order.npy", order)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def key(self, i):
+        return self[i].lower() if self.ignore_case else self[i]
+
+    def find(self, value):
+        """
+        Returns the indices of all strings equal to value.
+        """
+        if self.ignore_case:
+            value = value.lower()
+
+        # Lower bound of value in sorted order
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(int(self.order[middle])) < value:
+                low = middle + 1
+            else:
+                high = middle
+
+        found = []
+        while low < len(self.order) and self.key(int(self.order[low])) == value:
+            found.append(int(self.order[low]))
+            low += 1
+        return found
+
+
+class TableIndex():
+    """
+    String -> index lookup on a StringTable of unique strings, usable where
+    CSRGraph expects its person_index/movie_index dicts.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, value):
+        found = self.table.find(value)
+        if not found:
+            raise KeyError(value)
+        return found[0]
+
+    def __contains__(self, value):
+        return bool(self.table.find(value))
+
+    def get(self, value, default=None):
+        found = self.table.find(value)
+        return found[0] if found else default
+
+
+class Snapshot():
+    """
+    A memory-mapped snapshot. `names`, `people` and `movies` are read-only
+    mappings with the same shape as the dicts in degrees.py, so the existing
+    lookup and printing code works on them unchanged.
+    """
+
+    def __init__(self, path):
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in GRAPH_ARRAYS}
+        self.tables = {
+            name: StringTable(os.path.join(path, name), ignore_case)
+            for name, ignore_case in STRING_COLUMNS.items()
+        }
+        self.graph = CSRGraph(
+            self.tables["person_ids"], self.tables["movie_ids"],
+            arrays["person_offsets"], arrays["person_movies"],
+            arrays["movie_offsets"], arrays["movie_people"],
+            person_index=TableIndex(self.tables["person_ids"]),
+            movie_index=TableIndex(self.tables["movie_ids"]),
+        )
+        self.names = NamesView(self)
+        self.people = PeopleView(self)
+        self.movies = MoviesView(self)
+
+
+class NamesView(Mapping):
+    """
+    Maps lowercase names to a set of corresponding person_ids.
+    """
+
+    def __init__(self, snapshot):
+        self.table = snapshot.tables["person_names"]
+        self.person_ids = snapshot.tables["person_ids"]
+
+    def __getitem__(self, name):
+        found = self.table.find(name)
+        if not found or name != name.lower():
+            raise KeyError(name)
+        return {self.person_ids[i] for i in found}
+
+    def __iter__(self):
+        previous = None
+        for i in self.table.order:
+            name = self.table.key(int(i))
+            if name != previous:
+                yield name
+                previous = name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class PeopleView(Mapping):
+    """
+    Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids).
+    """
+
+    def __init__(self, snapshot):
+        self.graph = snapshot.graph
+        self.names = snapshot.tables["person_names"]
+        self.births = snapshot.tables["person_births"]
+
+    def __getitem__(self, person_id):
+        i = self.graph.person_index[person_id]
+        return {
+            "name": self.names[i],
+            "birth": self.births[i],
+            "movies": {self.graph.movie_ids[m] for m in self.graph.movies_for(i)},
+        }
+
+    def __iter__(self):
+        return iter(self.graph.person_ids)
+
+    def __len__(self):
+        return len(self.graph.person_ids)
+
+
+class MoviesView(Mapping):
+    """
+    Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids).
+    """
+
+    def __init__(self, snapshot):
+        self.graph = snapshot.graph
+        self.titles = snapshot.tables["movie_titles"]
+        self.years = snapshot.tables["movie_years"]
+
+    def __getitem__(self, movie_id):
+        i = self.graph.movie_index[movie_id]
+        return {
+            "title": self.titles[i],
+            "year": self.years[i],
+            "stars": {self.graph.person_ids[p] for p in self.graph.stars_for(i)},
+        }
+
+    def __iter__(self):
+        return iter(self.graph.movie_ids)
+
+    def __len__(self):
+        return len(self.graph.movie_ids)
@@ -1,3 +1,40 @@
+from collections import deque
+import heapq
+import itertools
+import os
+
+# The CSV files that make up a degrees data directory
+CSV_FILES = ("people.csv", "movies.csv", "stars.csv")
+
+
+def csv_signature(directory):
+    """
+    Returns the size and modification time of each CSV file in directory,
+    so caches built from them can tell when they are out of date.
+    """
+    signature = {}
+    for filename in CSV_FILES:
+        stat = os.stat(os.path.join(directory, filename))
+        signature[filename] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def path_to(parents, target):
+    """
+    Returns the list of (movie_id, person_id) pairs from the tree's
+    source to target, or None if target was not reached.
+    """
+    if target not in parents:
+        return None
+    path = []
+    while parents[target] is not None:
+        movie_id, previous = parents[target]
+        path.append((movie_id, target))
+        target = previous
+    path.reverse()
+    return path
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -36,3 +73,74 @@ class QueueFrontier(StackFrontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+# The frontiers below keep the same add/remove/empty/contains_state API as the
+# ones above, but never copy the list on remove and keep a companion count of
+# the states in the frontier so contains_state is a hash lookup instead of a
+# linear scan.
+
+class FastStackFrontier():
+    def __init__(self):
+        self.frontier = []
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def _forget(self, node):
+        # The same state can be added more than once, so only drop it from
+        # the lookup once its last copy has left the frontier
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.pop())
+
+
+class FastQueueFrontier(FastStackFrontier):
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.popleft())
+
+
+class PriorityFrontier(FastStackFrontier):
+    """
+    Heap-backed frontier that always removes the node with the lowest
+    priority(node). Nodes with equal priority come out in insertion order.
+    """
+
+    def __init__(self, priority):
+        super().__init__()
+        self.priority = priority
+        self.counter = itertools.count()
+
+    def add(self, node):
+        heapq.heappush(self.frontier, (self.priority(node), next(self.counter), node))
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(heapq.heappop(self.frontier)[2])
@@ -0,0 +1,169 @@
+"""
+Bitboard Tic Tac Toe engine
+
+A drop-in alternative to tictactoe.minimax. The board is encoded as two 9-bit
+masks, one for X and one for O, where bit 3 * i + j is cell (i, j). Wins are
+checked against the 8 precomputed line masks, children are made by setting a
+bit instead of deep-copying the board, and the score of every position is
+memoized in a transposition table, so each of the 5478 reachable positions is
+searched at most once per process.
+
+Positions that are rotations or reflections of each other have the same
+value, so the table is keyed by the canonical (smallest) of the 8 symmetric
+versions of a position. That stores 765 positions instead of 5478; set
+SYMMETRIC_KEYS to False to key by the position itself.
+
+Usage: python bitboard.py    (compares the table size with both keys)
+"""
+
+import sys
+import time
+
+import tictactoe as ttt
+
+FULL = 0b111111111
+
+# The 8 winning lines: 3 rows, 3 columns, 2 diagonals
+LINES = (
+    [0b111 << (3 * i) for i in range(3)]
+    + [0b001001001 << j for j in range(3)]
+    + [0b100010001, 0b001010100]
+)
+
+# Cells in the same order as tictactoe.actions, so ties are broken the same way
+MOVES = [(i, j) for i in range(3) for j in range(3)]
+
+# Transposition table: (x mask, o mask) -> minimax value (1, 0 or -1)
+TABLE = {}
+
+# Key TABLE by the canonical version of each position
+SYMMETRIC_KEYS = True
+
+
+def _symmetries():
+    """
+    Returns the 8 symmetries of the board (4 rotations, each optionally
+    mirrored) as lists mapping each bit to the bit it moves to.
+    """
+    symmetries = []
+    for mirrored in (False, True):
+        for turns in range(4):
+            permutation = []
+            for bit in range(9):
+                i, j = divmod(bit, 3)
+                for _ in range(turns):
+                    i, j = j, 2 - i
+                if mirrored:
+                    j = 2 - j
+                permutation.append(3 * i + j)
+            symmetries.append(permutation)
+    return symmetries
+
+
+SYMMETRIES = _symmetries()
+
+# INVERSE[t] is the symmetry that undoes symmetry t
+INVERSE = [SYMMETRIES.index([p.index(bit) for bit in range(9)]) for p in SYMMETRIES]
+
+# TRANSFORMED[t][mask] is mask with symmetry t applied, for all 512 masks
+TRANSFORMED = [
+    [sum(1 << p[bit] for bit in range(9) if mask & (1 << bit)) for mask in range(512)]
+    for p in SYMMETRIES
+]
+
+
+def canonical(x, o):
+    """
+    Returns ((x, o), t): the smallest of the 8 symmetric versions of the
+    position, and the symmetry t that maps the position onto it.
+    """
+    return min(((TRANSFORMED[t][x], TRANSFORMED[t][o]), t) for t in range(8))
+
+
+def encode(board):
+    """
+    Returns the (x, o) masks for a list-of-lists board.
+    """
+    x = o = 0
+    for i, j in MOVES:
+        if board[i][j] == ttt.X:
+            x |= 1 << (3 * i + j)
+        elif board[i][j] == ttt.O:
+            o |= 1 << (3 * i + j)
+    return x, o
+
+
+def has_won(mask):
+    return any(mask & line == line for line in LINES)
+
+
+def value(x, o):
+    """
+    Returns the minimax value of a position: 1 if X wins with perfect play,
+    -1 if O does, 0 for a tie.
+    """
+    key = canonical(x, o)[0] if SYMMETRIC_KEYS else (x, o)
+    if key in TABLE:
+        return TABLE[key]
+
+    if has_won(x):
+        result = 1
+    elif has_won(o):
+        result = -1
+    elif x | o == FULL:
+        result = 0
+    else:
+        empty = FULL & ~(x | o)
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        children = []
+        for bit in range(9):
+            if empty & (1 << bit):
+                if x_to_move:
+                    children.append(value(x | (1 << bit), o))
+                else:
+                    children.append(value(x, o | (1 << bit)))
+        result = max(children) if x_to_move else min(children)
+
+    TABLE[key] = result
+    return result
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    x, o = encode(board)
+    if has_won(x) or has_won(o) or x | o == FULL:
+        return None
+
+    x_to_move = bin(x).count("1") == bin(o).count("1")
+    optimal_action = None
+    optimal_score = None
+    for i, j in MOVES:
+        bit = 1 << (3 * i + j)
+        if (x | o) & bit:
+            continue
+        v = value(x | bit, o) if x_to_move else value(x, o | bit)
+        if optimal_score is None or (v > optimal_score if x_to_move else v < optimal_score):
+            optimal_score = v
+            optimal_action = (i, j)
+    return optimal_action
+
+
+def main():
+    global SYMMETRIC_KEYS
+    if len(sys.argv) != 1:
+        sys.exit("Usage: python bitboard.py")
+
+    for symmetric in (False, True):
+        SYMMETRIC_KEYS = symmetric
+        TABLE.clear()
+        start = time.perf_counter()
+        value(0, 0)
+        seconds = time.perf_counter() - start
+        keys = "canonical" if symmetric else "plain"
+        print(f"{keys:>9} keys: {len(TABLE)} positions stored, solved in {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Perfect-play opening book for Tic Tac Toe
+
+Run once offline:
+
+    python book.py [book.bin]
+
+to enumerate every reachable position, keep one representative of each
+group of symmetric positions (the 8 rotations and reflections of the board),
+and store the optimal move for each in a compact table: one 32-bit word per
+position, holding the X mask, the O mask and the move cell.
+
+At runtime book.minimax(board) has the same signature as tictactoe.minimax
+and answers every move with one table lookup, so the runner's UI never waits
+on a search.
+"""
+
+import os
+import sys
+from array import array
+
+import bitboard
+from bitboard import FULL, INVERSE, SYMMETRIES, canonical, has_won, value
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# Canonical (x, o) -> move cell (0-8) in the canonical orientation
+BOOK = {}
+
+
+def best_move(x, o):
+    """
+    Returns the cell of an optimal move in position (x, o), trying cells in
+    the same order as tictactoe.minimax.
+    """
+    x_to_move = bin(x).count("1") == bin(o).count("1")
+    best_cell, best_score = None, None
+    for cell in range(9):
+        if (x | o) & (1 << cell):
+            continue
+        v = value(x | (1 << cell), o) if x_to_move else value(x, o | (1 << cell))
+        if best_score is None or (v > best_score if x_to_move else v < best_score):
+            best_cell, best_score = cell, v
+    return best_cell
+
+
+def generate():
+    """
+    Returns {canonical (x, o): move cell} for every reachable, unfinished
+    position, up to symmetry.
+    """
+    book = {}
+    stack = [(0, 0)]
+    seen = set()
+    while stack:
+        x, o = stack.pop()
+        key, _ = canonical(x, o)
+        if key in seen:
+            continue
+        seen.add(key)
+        x, o = key
+        if has_won(x) or has_won(o) or x | o == FULL:
+            continue
+        book[key] = best_move(x, o)
+
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        for cell in range(9):
+            if not (x | o) & (1 << cell):
+                stack.append((x | (1 << cell), o) if x_to_move else (x, o | (1 << cell)))
+    return book
+
+
+def write(book, filename=BOOK_FILE):
+    """
+    Writes the book as sorted 32-bit words: x | o << 9 | move << 18.
+    """
+    words = array("I", sorted(x | o << 9 | move << 18 for (x, o), move in book.items()))
+    with open(filename, "wb") as f:
+        words.tofile(f)
+
+
+def load(filename=BOOK_FILE):
+    """
+    Loads a book written by write() into BOOK.
+    If the file is missing, the book is generated in memory instead.
+    """
+    BOOK.clear()
+    if not os.path.exists(filename):
+        BOOK.update(generate())
+        return
+    words = array("I")
+    with open(filename, "rb") as f:
+        words.frombytes(f.read())
+    for word in words:
+        BOOK[(word & 0x1FF, (word >> 9) & 0x1FF)] = word >> 18
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    if not BOOK:
+        load()
+    x, o = bitboard.encode(board)
+    if has_won(x) or has_won(o) or x | o == FULL:
+        return None
+
+    # Look up the canonical position, then map its move back onto this board
+    key, t = canonical(x, o)
+    cell = SYMMETRIES[INVERSE[t]][BOOK[key]]
+    return divmod(cell, 3)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [book.bin]")
+    book = generate()
+    filename = sys.argv[1] if len(sys.argv) == 2 else BOOK_FILE
+    write(book, filename)
+    print(f"Wrote {len(book)} positions ({os.path.getsize(filename)} bytes) to {filename}")
@@ -0,0 +1,267 @@
+"""
+m,n,k Tic Tac Toe Player
+
+The same game API as tictactoe.py (initial_state, player, actions, result,
+winner, terminal, utility), for a board of any number of rows and columns
+where k in a row wins. tictactoe.py is the 3,3,3 case.
+
+Full minimax is infeasible beyond 3x3, so the AI uses iterative deepening:
+a depth-limited alpha-beta (negamax) search is repeated with depth 1, 2, 3...
+until the per-move time budget runs out, and the move from the deepest
+completed search is played. Positions at the depth limit are scored by a
+pluggable evaluation function.
+
+Usage: python mnk.py [rows cols k] [seconds per move]
+"""
+
+import math
+import sys
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Score of a won position; wins found sooner score higher
+WIN = 1000000
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Game():
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError("win length must fit on the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        # Evaluations are clamped below the score of the slowest win, so the
+        # search never mistakes one for a forced result
+        self.max_evaluation = WIN - rows * cols - 1
+
+        # Every window of k cells in a row: horizontal, vertical and both diagonals
+        self.lines = []
+        for i in range(rows):
+            for j in range(cols):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.lines.append(tuple((i + di * n, j + dj * n) for n in range(k)))
+
+        # The windows through each cell, so a move only checks its own lines
+        self.lines_through = {(i, j): [] for i in range(rows) for j in range(cols)}
+        for line in self.lines:
+            for cell in line:
+                self.lines_through[cell].append(line)
+
+        # Search moves near the center first
+        center = ((rows - 1) / 2, (cols - 1) / 2)
+        self.move_order = sorted(
+            self.lines_through, key=lambda cell: abs(cell[0] - center[0]) + abs(cell[1] - center[1])
+        )
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.cols for _ in range(self.rows)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        count_of_x = sum(row.count(X) for row in board)
+        count_of_o = sum(row.count(O) for row in board)
+        return O if count_of_x > count_of_o else X
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.rows) for j in range(self.cols) if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] != EMPTY:
+            raise ValueError("Invalid Move")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def wins_at(self, board, cell):
+        """
+        Returns True if the mark on cell completes a line through it.
+        """
+        mark = board[cell[0]][cell[1]]
+        return mark != EMPTY and any(
+            all(board[i][j] == mark for i, j in line) for line in self.lines_through[cell]
+        )
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for line in self.lines:
+            i, j = line[0]
+            mark = board[i][j]
+            if mark != EMPTY and all(board[i][j] == mark for i, j in line):
+                return mark
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(cell != EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner = self.winner(board)
+        return 1 if winner == X else -1 if winner == O else 0
+
+
+def line_evaluation(game, board):
+    """
+    Default evaluation, from X's point of view: every window still open to
+    only one player counts 10^(marks in it), for X or against X. On large
+    boards the sum can exceed WIN; the search clamps it to game.max_evaluation.
+    """
+    score = 0
+    for line in game.lines:
+        x = o = 0
+        for i, j in line:
+            if board[i][j] == X:
+                x += 1
+            elif board[i][j] == O:
+                o += 1
+        if o == 0 and x:
+            score += 10 ** x
+        elif x == 0 and o:
+            score -= 10 ** o
+    return score
+
+
+def iterative_deepening(game, board, time_limit=1.0, evaluate=line_evaluation, max_depth=None):
+    """
+    Returns (action, stats) for the current player, searching deeper until
+    time_limit seconds have passed. stats holds the depth of the deepest
+    completed search, its value for the player to move, the number of
+    positions visited and the seconds used.
+    """
+    start = time.perf_counter()
+    deadline = start + time_limit
+    board = [row[:] for row in board]
+    empty = [cell for cell in game.move_order if board[cell[0]][cell[1]] == EMPTY]
+    if not empty or game.winner(board) is not None:
+        return None, {"depth": 0, "value": 0, "nodes": 0, "seconds": 0.0}
+
+    mark = game.player(board)
+    sign = 1 if mark == X else -1
+    stats = {"depth": 0, "value": 0, "nodes": 0}
+    best_action = empty[0]
+    limit = len(empty) if max_depth is None else min(max_depth, len(empty))
+
+    for depth in range(1, limit + 1):
+        try:
+            value, action = _root(game, board, empty, best_action, mark, sign, depth, evaluate, deadline, stats)
+        except SearchTimeout:
+            break
+        best_action = action
+        stats["depth"] = depth
+        stats["value"] = value
+        # A forced win or loss won't change with more depth
+        if abs(value) >= WIN - len(empty):
+            break
+
+    stats["seconds"] = time.perf_counter() - start
+    return best_action, stats
+
+
+def _root(game, board, empty, first, mark, sign, depth, evaluate, deadline, stats):
+    """
+    Searches every move to depth, trying the previous best move first.
+    Returns (value, action).
+    """
+    alpha, beta = -math.inf, math.inf
+    best_action = None
+    for cell in [first] + [cell for cell in empty if cell != first]:
+        board[cell[0]][cell[1]] = mark
+        try:
+            value = -_negamax(game, board, cell, other(mark), -sign, depth - 1, 1, -beta, -alpha,
+                              evaluate, deadline, stats)
+        finally:
+            board[cell[0]][cell[1]] = EMPTY
+        if value > alpha or best_action is None:
+            alpha = value
+            best_action = cell
+    return alpha, best_action
+
+
+def _negamax(game, board, last, mark, sign, depth, ply, alpha, beta, evaluate, deadline, stats):
+    """
+    Returns the value of board for `mark` (to move), where `last` is the move
+    just made by the opponent. sign is 1 if mark is X, -1 if it is O.
+    The board is updated in place and restored before returning.
+    """
+    stats["nodes"] += 1
+    if time.perf_counter() > deadline:
+        raise SearchTimeout()
+
+    # Only the opponent's last move can have won the game
+    if game.wins_at(board, last):
+        return -(WIN - ply)
+
+    moves = [cell for cell in game.move_order if board[cell[0]][cell[1]] == EMPTY]
+    if not moves:
+        return 0
+    if depth == 0:
+        value = max(-game.max_evaluation, min(game.max_evaluation, evaluate(game, board)))
+        return sign * value
+
+    best = -math.inf
+    for cell in moves:
+        board[cell[0]][cell[1]] = mark
+        try:
+            value = -_negamax(game, board, cell, other(mark), -sign, depth - 1, ply + 1, -beta, -alpha,
+                              evaluate, deadline, stats)
+        finally:
+            board[cell[0]][cell[1]] = EMPTY
+        best = max(best, value)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+    return best
+
+
+def other(mark):
+    return O if mark == X else X
+
+
+def main():
+    if len(sys.argv) not in (1, 2, 4, 5):
+        sys.exit("Usage: python mnk.py [rows cols k] [seconds per move]")
+    rows, cols, k = (int(arg) for arg in sys.argv[1:4]) if len(sys.argv) >= 4 else (3, 3, 3)
+    time_limit = float(sys.argv[-1]) if len(sys.argv) in (2, 5) else 1.0
+
+    # AI vs AI
+    game = Game(rows, cols, k)
+    board = game.initial_state()
+    while not game.terminal(board):
+        action, stats = iterative_deepening(game, board, time_limit)
+        print(f"{game.player(board)} plays {action} (depth {stats['depth']}, "
+              f"{stats['nodes']} nodes, {stats['seconds']:.2f}s)")
+        board = game.result(board, action)
+    for row in board:
+        print(" ".join(cell or "." for cell in row))
+    winner = game.winner(board)
+    print(f"Game Over: {winner} wins." if winner else "Game Over: Tie.")
+
+
+if __name__ == "__main__":
+    main()
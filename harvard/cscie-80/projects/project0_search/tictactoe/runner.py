@@ -3,6 +3,21 @@ import sys
 import time
 
 import tictactoe as ttt
+import bitboard
+import book
+
+# The AI's move function, chosen with "python runner.py [engine]"
+engines = {
+    "minimax": ttt.minimax,
+    "alphabeta": ttt.alphabeta,
+    "bitboard": bitboard.minimax,
+    "book": book.minimax,
+}
+if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] not in engines):
+    sys.exit(f"Usage: python runner.py [{'|'.join(engines)}]")
+ai_move = engines[sys.argv[1]] if len(sys.argv) == 2 else ttt.minimax
+if ai_move is book.minimax:
+    book.load()
 
 pygame.init()
 size = width, height = 600, 400
@@ -112,7 +127,7 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                move = ttt.minimax(board)
+                move = ai_move(board)
                 board = ttt.result(board, move)
                 ai_turn = False
             else:
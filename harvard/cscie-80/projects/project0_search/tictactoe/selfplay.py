@@ -0,0 +1,166 @@
+"""
+Headless self-play benchmark for the Tic Tac Toe AI
+
+Plays games through the tictactoe.py API without pygame, either
+
+    AI vs random    the AI alternates between X and O against a player
+                    picking uniformly random moves; it should never lose
+    AI vs AI        the engine plays both sides; perfect play always ties
+
+and reports, for each engine, the outcome counts, the latency of its moves
+(50th / 90th / 99th percentile and max) and the nodes it searched per move.
+Several engines can be named to compare them side by side.
+
+Nodes are the positions the engine visited: tictactoe.nodes_visited for
+minimax and alphabeta, newly cached positions for bitboard (so later moves
+cost nothing once the table is warm), and 0 for the book, which only looks
+moves up.
+
+Usage: python selfplay.py [engine ...] [--games=N] [--seed=N] [--mode=random|self|both]
+
+Engines default to bitboard and book. The list-of-lists engines are much
+slower: alphabeta plays 1000 games in minutes, and full minimax takes over
+ten seconds on the opening move, so use a small --games with them.
+"""
+
+import random
+import sys
+import time
+
+import tictactoe as ttt
+import bitboard
+import book
+
+ENGINES = {
+    "minimax": ttt.minimax,
+    "alphabeta": ttt.alphabeta,
+    "bitboard": bitboard.minimax,
+    "book": book.minimax,
+}
+
+MODES = ("random", "self")
+
+
+def timed_move(engine, board):
+    """
+    Returns (action, seconds, nodes) for the engine's move on board.
+    """
+    table_size = len(bitboard.TABLE)
+    start = time.perf_counter()
+    action = ENGINES[engine](board)
+    seconds = time.perf_counter() - start
+
+    if engine in ("minimax", "alphabeta"):
+        nodes = ttt.nodes_visited
+    elif engine == "bitboard":
+        nodes = len(bitboard.TABLE) - table_size
+    else:
+        nodes = 0
+    return action, seconds, nodes
+
+
+def play_game(engine, ai_players, rng, stats):
+    """
+    Plays one game. ai_players holds the marks the engine plays; the other
+    mark moves at random. Returns the winner (X, O or None).
+    Each engine move is added to stats["seconds"] and stats["nodes"].
+    """
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        if ttt.player(board) in ai_players:
+            action, seconds, nodes = timed_move(engine, board)
+            stats["seconds"].append(seconds)
+            stats["nodes"].append(nodes)
+        else:
+            action = rng.choice(sorted(ttt.actions(board)))
+        # result raises on an illegal move
+        board = ttt.result(board, action)
+    return ttt.winner(board)
+
+
+def run(engine, mode, games, seed):
+    """
+    Plays `games` games of engine in mode ("random" or "self").
+    Returns stats with the outcome counts and the per-move samples.
+    """
+    rng = random.Random(seed)
+    stats = {"win": 0, "tie": 0, "loss": 0, "X": 0, "O": 0, "seconds": [], "nodes": []}
+    for game in range(games):
+        if mode == "self":
+            winner = play_game(engine, (ttt.X, ttt.O), rng, stats)
+            stats[winner or "tie"] += 1
+        else:
+            # Alternate the side the AI plays
+            mark = ttt.X if game % 2 == 0 else ttt.O
+            winner = play_game(engine, (mark,), rng, stats)
+            stats["tie" if winner is None else "win" if winner == mark else "loss"] += 1
+    return stats
+
+
+def percentile(samples, p):
+    """
+    Returns the p-th percentile of samples (nearest rank).
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(p / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def report(engine, mode, stats):
+    seconds = stats["seconds"]
+    nodes = stats["nodes"]
+    if mode == "self":
+        outcomes = f"X {stats['X']:>5} / tie {stats['tie']:>5} / O {stats['O']:>5}"
+    else:
+        outcomes = f"win {stats['win']:>5} / tie {stats['tie']:>5} / loss {stats['loss']:>5}"
+    latency = " ".join(
+        f"{label} {1000 * value:8.3f}"
+        for label, value in (
+            ("p50", percentile(seconds, 50)),
+            ("p90", percentile(seconds, 90)),
+            ("p99", percentile(seconds, 99)),
+            ("max", max(seconds, default=0.0)),
+        )
+    )
+    mean_nodes = sum(nodes) / len(nodes) if nodes else 0
+    print(f"{engine:<10} vs {mode:<6} {outcomes}  |  {len(seconds):>6} moves, ms: {latency}"
+          f"  |  nodes/move {mean_nodes:10.1f}, max {max(nodes, default=0)}")
+
+
+def main():
+    games = 1000
+    seed = 0
+    modes = MODES
+    engines = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--games="):
+            games = int(arg.split("=", 1)[1])
+        elif arg.startswith("--seed="):
+            seed = int(arg.split("=", 1)[1])
+        elif arg.startswith("--mode="):
+            mode = arg.split("=", 1)[1]
+            if mode not in MODES + ("both",):
+                sys.exit("--mode must be random, self or both")
+            modes = MODES if mode == "both" else (mode,)
+        elif arg in ENGINES:
+            engines.append(arg)
+        else:
+            sys.exit(f"Usage: python selfplay.py [{'|'.join(ENGINES)} ...] "
+                     "[--games=N] [--seed=N] [--mode=random|self|both]")
+    if not engines:
+        engines = ["bitboard", "book"]
+
+    if "book" in engines:
+        book.load()
+
+    for mode in modes:
+        for engine in engines:
+            # Same seed for every engine, so they face the same random moves
+            # as long as they play the same way
+            report(engine, mode, run(engine, mode, games, seed))
+
+
+if __name__ == "__main__":
+    main()
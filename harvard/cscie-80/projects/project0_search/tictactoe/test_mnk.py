@@ -0,0 +1,39 @@
+from mnk import WIN, Game, iterative_deepening, line_evaluation
+from tictactoe import X, O, EMPTY
+
+
+def crowded_board(game):
+    """
+    X on every cell whose row and column are not 2 mod 3: every window
+    holds at most 4 Xs, so nobody can win in one move, but the open
+    windows add up to more than WIN.
+    """
+    return [[X if i % 3 != 2 and j % 3 != 2 else EMPTY for j in range(game.cols)]
+            for i in range(game.rows)]
+
+
+def test_large_board_evaluation_is_not_a_win():
+    game = Game(19, 19, 6)
+    board = crowded_board(game)
+    empty = sum(row.count(EMPTY) for row in board)
+    assert game.winner(board) is None
+    assert line_evaluation(game, board) > WIN
+
+    action, stats = iterative_deepening(game, board, time_limit=60, max_depth=1)
+    assert action is not None
+    assert stats["depth"] == 1
+    assert abs(stats["value"]) < WIN - empty
+    assert abs(stats["value"]) <= game.max_evaluation
+
+
+def test_large_board_win_still_found():
+    game = Game(19, 19, 6)
+    board = [[EMPTY] * game.cols for _ in range(game.rows)]
+    for j in range(5):
+        board[9][j + 5] = X
+        board[0][2 * j] = O
+    empty = sum(row.count(EMPTY) for row in board)
+
+    action, stats = iterative_deepening(game, board, time_limit=60, max_depth=1)
+    assert action in ((9, 4), (9, 10))
+    assert stats["value"] >= WIN - empty
@@ -9,6 +9,12 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# Number of positions visited by the last call to minimax or alphabeta
+nodes_visited = 0
+
+# Move ordering for alphabeta: center first, then corners, then edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)]
+
 
 def initial_state():
     """
@@ -147,6 +153,9 @@ def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
+    global nodes_visited
+    nodes_visited = 0
+
     # If the board is terminal return None
     if terminal(board):
         return None
@@ -175,6 +184,8 @@ def minimax(board):
 # Function that recursively compuetes the scores
 
 def min_score(board):
+    global nodes_visited
+    nodes_visited += 1
     if terminal(board):
         return utility((board))
     
@@ -185,6 +196,8 @@ def min_score(board):
 
 
 def max_score(board):
+    global nodes_visited
+    nodes_visited += 1
     if terminal(board):
         return utility((board))
     
@@ -193,3 +206,73 @@ def max_score(board):
         optimal_score = max(optimal_score, min_score(result(board, action)))
     return optimal_score
     
+
+
+def ordered_actions(board):
+    """
+    Returns the possible actions, center first, then corners, then edges.
+    Strong moves first means alpha-beta finds good bounds early and prunes more.
+    """
+    return [action for action in MOVE_ORDER if board[action[0]][action[1]] == EMPTY]
+
+
+def alphabeta(board):
+    """
+    Returns the optimal action for the current player on the board,
+    like minimax, but skips branches that cannot change the result (alpha-beta pruning).
+    """
+    global nodes_visited
+    nodes_visited = 0
+
+    if terminal(board):
+        return None
+
+    # alpha is the best score X is already guaranteed, beta the best score O is guaranteed
+    alpha = -math.inf
+    beta = math.inf
+    optimal_action = None
+    if player(board) == X:
+        for action in ordered_actions(board):
+            v = alphabeta_min(result(board, action), alpha, beta)
+            if v > alpha:
+                alpha = v
+                optimal_action = action
+    else:
+        for action in ordered_actions(board):
+            v = alphabeta_max(result(board, action), alpha, beta)
+            if v < beta:
+                beta = v
+                optimal_action = action
+    return optimal_action
+
+
+def alphabeta_min(board, alpha, beta):
+    global nodes_visited
+    nodes_visited += 1
+    if terminal(board):
+        return utility(board)
+
+    optimal_score = math.inf
+    for action in ordered_actions(board):
+        optimal_score = min(optimal_score, alphabeta_max(result(board, action), alpha, beta))
+        # X already has a better option elsewhere, so X will never let O get here
+        if optimal_score <= alpha:
+            return optimal_score
+        beta = min(beta, optimal_score)
+    return optimal_score
+
+
+def alphabeta_max(board, alpha, beta):
+    global nodes_visited
+    nodes_visited += 1
+    if terminal(board):
+        return utility(board)
+
+    optimal_score = -math.inf
+    for action in ordered_actions(board):
+        optimal_score = max(optimal_score, alphabeta_min(result(board, action), alpha, beta))
+        # O already has a better option elsewhere
+        if optimal_score >= beta:
+            return optimal_score
+        alpha = max(alpha, optimal_score)
+    return optimal_score
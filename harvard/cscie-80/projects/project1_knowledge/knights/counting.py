@@ -0,0 +1,245 @@
+"""
+Model enumeration and model counting for logic.py
+
+satisfying_models(knowledge) yields every model of the knowledge base, one
+at a time, and count_models(knowledge) returns how many there are, without
+going through all 2^n assignments.
+
+Both work on residual sentences. Assigning a symbol simplifies the sentence
+(And(P, Q) with P true is just Q, with P false it is false), so a branch
+stops as soon as its residual is true or false. When it becomes true, every
+assignment of the symbols left is a model. The counter also
+
+    splits a conjunction into components that share no symbols, and
+    multiplies their counts instead of branching on them together
+    caches the count of every residual it has seen, so a residual reached
+    along several branches is only counted once
+
+Residuals are interned (see logic.intern), so cache lookups are cheap and
+sub-sentences that don't mention the assigned symbol are reused unchanged.
+"""
+
+import itertools
+
+from logic import And, Biconditional, Implication, Interned, Not, Or, Symbol, intern
+
+
+def simplify(sentence, name, value, memo=None):
+    """
+    Returns sentence with symbol `name` set to value: True, False, or an
+    interned residual sentence over the other symbols.
+    """
+    if memo is None:
+        memo = {}
+    if sentence is True or sentence is False:
+        return sentence
+    if not isinstance(sentence, Interned):
+        sentence = intern(sentence)
+    if name not in sentence._symbols:
+        return sentence
+    # Shared sub-sentences are only simplified once
+    if id(sentence) in memo:
+        return memo[id(sentence)]
+
+    if isinstance(sentence, Symbol):
+        result = value
+    elif isinstance(sentence, Not):
+        result = negate(simplify(sentence.operand, name, value, memo))
+    elif isinstance(sentence, And):
+        result = conjunction(simplify(conjunct, name, value, memo) for conjunct in sentence.conjuncts)
+    elif isinstance(sentence, Or):
+        result = disjunction(simplify(disjunct, name, value, memo) for disjunct in sentence.disjuncts)
+    elif isinstance(sentence, Implication):
+        antecedent = simplify(sentence.antecedent, name, value, memo)
+        consequent = simplify(sentence.consequent, name, value, memo)
+        if antecedent is False or consequent is True:
+            result = True
+        elif antecedent is True:
+            result = consequent
+        elif consequent is False:
+            result = negate(antecedent)
+        else:
+            result = intern(Implication(antecedent, consequent))
+    else:
+        left = simplify(sentence.left, name, value, memo)
+        right = simplify(sentence.right, name, value, memo)
+        if isinstance(left, bool) and isinstance(right, bool):
+            result = left == right
+        elif isinstance(left, bool):
+            result = right if left else negate(right)
+        elif isinstance(right, bool):
+            result = left if right else negate(left)
+        else:
+            result = intern(Biconditional(left, right))
+
+    memo[id(sentence)] = result
+    return result
+
+
+def negate(sentence):
+    if isinstance(sentence, bool):
+        return not sentence
+    if isinstance(sentence, Not):
+        return sentence.operand
+    return intern(Not(sentence))
+
+
+def conjunction(conjuncts):
+    """Returns the And of conjuncts, dropping trues and flattening nested Ands."""
+    flat = {}
+    for conjunct in conjuncts:
+        if conjunct is False:
+            return False
+        if conjunct is True:
+            continue
+        for part in (conjunct.conjuncts if isinstance(conjunct, And) else [conjunct]):
+            flat[part] = None
+    if not flat:
+        return True
+    if len(flat) == 1:
+        return next(iter(flat))
+    return intern(And(*flat))
+
+
+def disjunction(disjuncts):
+    """Returns the Or of disjuncts, dropping falses and flattening nested Ors."""
+    flat = {}
+    for disjunct in disjuncts:
+        if disjunct is True:
+            return True
+        if disjunct is False:
+            continue
+        for part in (disjunct.disjuncts if isinstance(disjunct, Or) else [disjunct]):
+            flat[part] = None
+    if not flat:
+        return False
+    if len(flat) == 1:
+        return next(iter(flat))
+    return intern(Or(*flat))
+
+
+def components(sentence):
+    """
+    Splits a conjunction into conjunctions that share no symbols.
+    Returns a list of sentences (just [sentence] if it doesn't split).
+    """
+    if not isinstance(sentence, And):
+        return [sentence]
+
+    # Union-find over symbols: conjuncts sharing a symbol join one group
+    parent = {}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for conjunct in sentence.conjuncts:
+        names = iter(conjunct._symbols)
+        first = next(names)
+        parent.setdefault(first, first)
+        root = find(first)
+        for name in names:
+            parent.setdefault(name, name)
+            parent[find(name)] = root
+
+    groups = {}
+    for conjunct in sentence.conjuncts:
+        groups.setdefault(find(next(iter(conjunct._symbols))), []).append(conjunct)
+    if len(groups) == 1:
+        return [sentence]
+    return [group[0] if len(group) == 1 else intern(And(*group)) for group in groups.values()]
+
+
+def branch_symbol(sentence):
+    """Returns the symbol to assign next: the one in the most conjuncts."""
+    if isinstance(sentence, And):
+        occurrences = {}
+        for conjunct in sentence.conjuncts:
+            for name in conjunct._symbols:
+                occurrences[name] = occurrences.get(name, 0) + 1
+        return max(sorted(occurrences), key=occurrences.get)
+    return min(sentence._symbols)
+
+
+class ModelCounter():
+
+    def __init__(self):
+        # Interned residual -> number of models over its own symbols
+        self.cache = {}
+        self.hits = 0
+        self.splits = 0
+        self.branches = 0
+
+    def count(self, sentence, symbols):
+        """
+        Returns the number of models of sentence (True, False or a
+        residual) over `symbols`, which holds all of its symbols.
+        """
+        if sentence is True:
+            return 2 ** len(symbols)
+        if sentence is False:
+            return 0
+        free = len(symbols) - len(sentence._symbols)
+        return self.count_residual(sentence) << free
+
+    def count_residual(self, sentence):
+        if sentence in self.cache:
+            self.hits += 1
+            return self.cache[sentence]
+
+        parts = components(sentence)
+        if len(parts) > 1:
+            self.splits += 1
+            result = 1
+            for part in parts:
+                result *= self.count_residual(part)
+                if not result:
+                    break
+        else:
+            self.branches += 1
+            name = branch_symbol(sentence)
+            rest = sentence._symbols - {name}
+            result = (self.count(simplify(sentence, name, True), rest)
+                      + self.count(simplify(sentence, name, False), rest))
+
+        self.cache[sentence] = result
+        return result
+
+    def stats(self):
+        return {"cached": len(self.cache), "hits": self.hits, "splits": self.splits, "branches": self.branches}
+
+
+def count_models(knowledge, symbols=None):
+    """
+    Returns the number of models of knowledge over its symbols, plus any
+    extra symbol names given in `symbols`.
+    """
+    names = knowledge.symbols() | set(symbols or ())
+    return ModelCounter().count(intern(knowledge), names)
+
+
+def satisfying_models(knowledge, symbols=None):
+    """
+    Yields every model of knowledge as a dict of symbol name -> bool, over
+    its symbols plus any extra symbol names given in `symbols`. Symbols are
+    assigned in sorted order, true before false.
+    """
+    names = sorted(knowledge.symbols() | set(symbols or ()))
+
+    def search(residual, i, model):
+        if residual is False:
+            return
+        if residual is True:
+            # Every assignment of the remaining symbols is a model
+            for values in itertools.product((True, False), repeat=len(names) - i):
+                yield {**model, **dict(zip(names[i:], values))}
+            return
+        name = names[i]
+        for value in (True, False):
+            model[name] = value
+            yield from search(simplify(residual, name, value), i + 1, model)
+            del model[name]
+
+    yield from search(intern(knowledge), 0, {})
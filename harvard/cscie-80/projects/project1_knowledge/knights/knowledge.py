@@ -0,0 +1,126 @@
+"""
+Incremental knowledge base for logic.py
+
+Instead of building one big And and running model_check from scratch for
+every query, a KnowledgeBase takes sentences one at a time with add() and
+keeps them compiled (method="compiled", see truthtable.py) or in CNF
+(method="sat", see sat.py) as they arrive. Only the new sentences are
+compiled or converted.
+
+Answers are cached. Adding knowledge never makes an entailed query stop
+being entailed, so add() only forgets the queries that were not entailed.
+
+ask_all(queries) answers a whole batch together: with the compiled method
+in a single pass over the models, and with the SAT method by checking
+each counter-model found against all the queries still open.
+"""
+
+import sat
+import truthtable
+from logic import Sentence
+
+
+class KnowledgeBase():
+
+    def __init__(self, *sentences, method="compiled"):
+        if method not in ("compiled", "sat"):
+            raise ValueError(f"unknown method {method}")
+        self.method = method
+        self.sentences = []
+        # query -> True if entailed, False if not
+        self.answers = {}
+        self.hits = 0
+        self.misses = 0
+
+        # Registers of the sentences in the compiled program
+        self.program = truthtable.Program()
+        self.registers = []
+        self.cnf = sat.CNF()
+
+        self.add(*sentences)
+
+    def add(self, *sentences):
+        """Adds sentences to the knowledge base."""
+        for sentence in sentences:
+            Sentence.validate(sentence)
+            self.sentences.append(sentence)
+            if self.method == "compiled":
+                self.registers.append(self.program.compile(sentence))
+            else:
+                self.cnf.add(sentence)
+        if sentences:
+            # Entailed queries stay entailed; the others have to be asked again
+            self.answers = {query: answer for query, answer in self.answers.items() if answer}
+
+    def ask(self, query):
+        """Checks if the knowledge base entails query."""
+        return self.ask_all([query])[0]
+
+    def ask_all(self, queries):
+        """Returns a list saying whether the knowledge base entails each query."""
+        pending = []
+        for query in queries:
+            if query in self.answers:
+                self.hits += 1
+            elif query not in pending:
+                self.misses += 1
+                pending.append(query)
+
+        if pending:
+            if self.method == "compiled":
+                self.answers.update(self._compiled(pending))
+            else:
+                self.answers.update(self._sat(pending))
+        return [self.answers[query] for query in queries]
+
+    def _compiled(self, queries):
+        """Answers queries in one pass over all the models."""
+        # Compile the queries after the sentences, and drop them afterwards
+        # so later passes don't evaluate them (or their extra symbols)
+        size = len(self.program.instructions)
+        outputs = self.registers + [self.program.compile(query) for query in queries]
+        entailed = [True] * len(queries)
+        open_queries = len(queries)
+        for _, width, values in self.program.chunks(outputs=outputs):
+            kb = (1 << width) - 1
+            for value in values[:len(self.registers)]:
+                kb &= value
+            if not kb:
+                continue
+            for i, q in enumerate(values[len(self.registers):]):
+                if entailed[i] and kb & ~q:
+                    entailed[i] = False
+                    open_queries -= 1
+            # Every query already has a counter-model
+            if not open_queries:
+                break
+        self.program.truncate(size)
+        return dict(zip(queries, entailed))
+
+    def _sat(self, queries):
+        """Answers each query by refuting knowledge ∧ ¬query."""
+        # Definitions are conservative, so they can stay in the CNF
+        literals = [self.cnf.literal(query) for query in queries]
+        answers = {}
+        for query, literal in zip(queries, literals):
+            if query in answers:
+                continue
+            solver = sat.Solver(self.cnf.num_variables, self.cnf.clauses + [[-literal]])
+            model = solver.solve()
+            if model is None:
+                answers[query] = True
+                continue
+            # The counter-model also refutes every other query false in it
+            for other, other_literal in zip(queries, literals):
+                if other not in answers and model[abs(other_literal)] != (other_literal > 0):
+                    answers[other] = False
+        return answers
+
+    def stats(self):
+        """Returns the cache counters and the size of the knowledge base."""
+        return {
+            "sentences": len(self.sentences),
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self.answers),
+        }
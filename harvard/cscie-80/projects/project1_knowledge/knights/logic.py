@@ -1,7 +1,9 @@
 import itertools
+import weakref
 
 
 class Sentence():
+    __slots__ = ()
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -43,6 +45,7 @@ class Sentence():
 
 
 class Symbol(Sentence):
+    __slots__ = ("name",)
 
     def __init__(self, name):
         self.name = name
@@ -70,6 +73,8 @@ class Symbol(Sentence):
 
 
 class Not(Sentence):
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
         self.operand = operand
@@ -94,6 +99,8 @@ class Not(Sentence):
 
 
 class And(Sentence):
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
@@ -131,6 +138,8 @@ class And(Sentence):
 
 
 class Or(Sentence):
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
@@ -162,6 +171,8 @@ class Or(Sentence):
 
 
 class Implication(Sentence):
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
@@ -193,6 +204,8 @@ class Implication(Sentence):
 
 
 class Biconditional(Sentence):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
@@ -225,8 +238,152 @@ class Biconditional(Sentence):
         return set.union(self.left.symbols(), self.right.symbols())
 
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+class Interned():
+    """
+    Shared, immutable sentence made by intern(). Its hash and symbols are
+    computed once, when it is built, instead of walking the whole subtree
+    on every call.
+    """
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        # Interned nodes are only equal if built from equal children, so
+        # different hashes settle most comparisons
+        if isinstance(other, Interned) and self._hash != other._hash:
+            return False
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def symbols(self):
+        return set(self._symbols)
+
+    def add(self, conjunct):
+        raise TypeError("interned sentences cannot be changed")
+
+    def __reduce__(self):
+        # The stored hash comes from this process's string hashes, so a
+        # pickled node is rebuilt through intern() in the process loading it
+        if isinstance(self, Symbol):
+            arguments = (self.name,)
+        elif isinstance(self, Not):
+            arguments = (self.operand,)
+        elif isinstance(self, And):
+            arguments = tuple(self.conjuncts)
+        elif isinstance(self, Or):
+            arguments = tuple(self.disjuncts)
+        elif isinstance(self, Implication):
+            arguments = (self.antecedent, self.consequent)
+        else:
+            arguments = (self.left, self.right)
+        # The plain sentence class, e.g. And for InternedAnd
+        plain = type(self).__bases__[1]
+        return intern, (plain(*arguments),)
+
+
+class InternedSymbol(Interned, Symbol):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+class InternedNot(Interned, Not):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+class InternedAnd(Interned, And):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+class InternedOr(Interned, Or):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+class InternedImplication(Interned, Implication):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+class InternedBiconditional(Interned, Biconditional):
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+
+# Hash-consing table: (class, symbol name or interned children) -> node.
+# Entries go away with their node once nothing else refers to it
+INTERNED = weakref.WeakValueDictionary()
+
+
+def intern(sentence):
+    """
+    Returns the shared interned node that is structurally equal to sentence.
+    Equal sentences, and equal subsentences anywhere inside them, become
+    the same object, so a large knowledge base stores each only once.
+    """
+    if isinstance(sentence, Interned):
+        return sentence
+
+    if isinstance(sentence, Symbol):
+        key = (InternedSymbol, sentence.name)
+        children = ()
+    elif isinstance(sentence, Not):
+        children = (intern(sentence.operand),)
+        key = (InternedNot, children)
+    elif isinstance(sentence, And):
+        children = tuple(intern(conjunct) for conjunct in sentence.conjuncts)
+        key = (InternedAnd, children)
+    elif isinstance(sentence, Or):
+        children = tuple(intern(disjunct) for disjunct in sentence.disjuncts)
+        key = (InternedOr, children)
+    elif isinstance(sentence, Implication):
+        children = (intern(sentence.antecedent), intern(sentence.consequent))
+        key = (InternedImplication, children)
+    elif isinstance(sentence, Biconditional):
+        children = (intern(sentence.left), intern(sentence.right))
+        key = (InternedBiconditional, children)
+    else:
+        raise TypeError(f"cannot intern {type(sentence).__name__}")
+
+    node = INTERNED.get(key)
+    if node is None:
+        cls = key[0]
+        if cls is InternedSymbol:
+            node = cls(sentence.name)
+            node._symbols = frozenset([sentence.name])
+        else:
+            node = cls(*children)
+            if len(children) == 1:
+                node._symbols = children[0]._symbols
+            else:
+                node._symbols = frozenset().union(*(child._symbols for child in children))
+        # Same hash as the plain sentence, so the two can be mixed in dicts
+        node._hash = super(Interned, node).__hash__()
+        INTERNED[key] = node
+    return node
+
+
+def model_check(knowledge, query, method="enumerate"):
+    """
+    Checks if knowledge base entails query.
+    method chooses how:
+        "enumerate"  check every model in turn (below)
+        "compiled"   compile both sentences once and evaluate them on
+                     chunks of models at a time (see truthtable.py)
+        "sat"        prove knowledge ∧ ¬query has no model with a SAT
+                     solver, without enumerating models (see sat.py)
+        "parallel"   split the models among worker processes, which
+                     check them compiled (see parallel.py)
+    """
+    if method == "compiled":
+        import truthtable
+        return truthtable.entails(knowledge, query)
+    elif method == "sat":
+        import sat
+        return sat.entails(knowledge, query)
+    elif method == "parallel":
+        import parallel
+        return parallel.entails(knowledge, query)
+    elif method != "enumerate":
+        raise ValueError(f"unknown method {method}")
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
@@ -0,0 +1,147 @@
+"""
+Parallel model checking for logic.py
+
+Checking every model is embarrassingly parallel: fixing the first k symbols
+splits the 2^n models into 2^k prefixes that can be checked independently.
+Each worker process compiles the knowledge base and query once (see
+truthtable.py). It then checks the models of one prefix at a time, a chunk
+at a time. Prefixes are the top k symbols of the chunk number, so a prefix
+is a contiguous range of chunks.
+
+As soon as any worker finds a counter-model, a model where the knowledge
+holds and the query does not, the pool is terminated and the other
+prefixes are never finished.
+
+Usage: python parallel.py [symbols] [--workers=N]
+    (times a chain of implications over that many symbols)
+"""
+
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import truthtable
+from logic import And, Implication, Symbol
+
+# Prefixes per worker, so a worker that finishes early can take another
+PREFIXES_PER_WORKER = 4
+
+# The worker's compiled knowledge base and query
+PROGRAM = None
+
+# The parent's symbol order, which the worker's program has to match
+SYMBOLS = None
+
+
+def load_worker(knowledge, query, symbols):
+    """Pool initializer: compiles the sentences once per worker."""
+    global PROGRAM, SYMBOLS
+    PROGRAM = truthtable.Program([knowledge, query])
+    SYMBOLS = symbols
+
+
+def check_prefix(task):
+    """
+    Checks chunks start to stop - 1.
+    Returns (index of a counter-model or None, models checked).
+    """
+    start, stop, chunk_bits = task
+    # Chunk numbers only mean the same models if the symbols are the same
+    if PROGRAM.symbols != SYMBOLS:
+        raise RuntimeError(f"worker compiled symbols {PROGRAM.symbols}, expected {SYMBOLS}")
+    models = 0
+    for first, width, (kb, q) in PROGRAM.chunks(chunk_bits, start=start, stop=stop):
+        models += width
+        counter = kb & ~q
+        if counter:
+            return first + (counter & -counter).bit_length() - 1, models
+    return None, models
+
+
+def check(knowledge, query, workers=None, prefix_bits=None, context=None):
+    """
+    Checks if knowledge base entails query, with the models split over
+    2^prefix_bits prefixes and checked by `workers` processes, started
+    from the multiprocessing `context` if given.
+    Returns (entailed, stats) where stats holds the counter-model found
+    (or None), the models checked, seconds and models_per_second.
+    """
+    start_time = time.perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if prefix_bits is None:
+        prefix_bits = (workers * PREFIXES_PER_WORKER - 1).bit_length()
+
+    # Leave prefix_bits symbols out of each chunk so there are enough chunks
+    program = truthtable.Program([knowledge, query])
+    chunk_bits = min(truthtable.CHUNK_BITS, max(len(program.symbols) - prefix_bits, 0))
+    num_chunks = program.num_chunks(chunk_bits)
+    size = max(num_chunks >> prefix_bits, 1)
+    tasks = [(start, min(start + size, num_chunks), chunk_bits) for start in range(0, num_chunks, size)]
+
+    counter = None
+    models = 0
+    if workers > 1 and len(tasks) > 1:
+        make_pool = Pool if context is None else context.Pool
+        with make_pool(workers, initializer=load_worker, initargs=(knowledge, query, program.symbols)) as pool:
+            for index, checked in pool.imap_unordered(check_prefix, tasks):
+                models += checked
+                if index is not None:
+                    counter = index
+                    # Leaving the with block terminates the other workers
+                    break
+    else:
+        load_worker(knowledge, query, program.symbols)
+        for task in tasks:
+            counter, checked = check_prefix(task)
+            models += checked
+            if counter is not None:
+                break
+
+    seconds = time.perf_counter() - start_time
+    stats = {
+        "counter_model": None if counter is None else program.model(counter),
+        "models": models,
+        "prefixes": len(tasks),
+        "workers": workers,
+        "seconds": seconds,
+        "models_per_second": models / seconds if seconds else 0.0,
+    }
+    return counter is None, stats
+
+
+def entails(knowledge, query, workers=None):
+    """Checks if knowledge base entails query using a pool of processes."""
+    return check(knowledge, query, workers)[0]
+
+
+def main():
+    workers = os.cpu_count() or 1
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers=") and arg[len("--workers="):].isdigit():
+            workers = int(arg[len("--workers="):])
+        elif arg.isdigit() and not args:
+            args.append(int(arg))
+        else:
+            sys.exit("Usage: python parallel.py [symbols] [--workers=N]")
+    n = args[0] if args else 24
+
+    # P0 => P1 => ... => Pn-1 entails P0 => Pn-1, which needs every model
+    # checked, but not Pn-1, which stops at the first counter-model
+    symbols = [Symbol(f"P{i}") for i in range(n)]
+    knowledge = And(*(Implication(symbols[i], symbols[i + 1]) for i in range(n - 1)))
+    for query in (Implication(symbols[0], symbols[-1]), symbols[-1]):
+        start = time.perf_counter()
+        serial = truthtable.entails(knowledge, query)
+        serial_seconds = time.perf_counter() - start
+        entailed, stats = check(knowledge, query, workers)
+        assert entailed == serial
+        print(f"{query}: entailed={entailed}, serial {serial_seconds:.3f}s, "
+              f"{stats['workers']} workers {stats['seconds']:.3f}s, {stats['models']:,} models "
+              f"in {stats['prefixes']} prefixes, {stats['models_per_second']:,.0f} models/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import sys
+
 from logic import *
+from counting import count_models, satisfying_models
+from knowledge import KnowledgeBase
 
 AKnight = Symbol("A is a Knight")
 AKnave = Symbol("A is a Knave")
@@ -81,9 +85,16 @@ def main():
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
+            # Ask about every symbol in one pass over the models
+            kb = KnowledgeBase(*knowledge.conjuncts)
+            for symbol, entailed in zip(symbols, kb.ask_all(symbols)):
+                if entailed:
                     print(f"    {symbol}")
+            # python puzzle.py --models also lists the assignments that survive
+            if "--models" in sys.argv:
+                print(f"    {count_models(knowledge)} model(s):")
+                for model in satisfying_models(knowledge):
+                    print("        " + ", ".join(name for name, value in model.items() if value))
 
 
 if __name__ == "__main__":
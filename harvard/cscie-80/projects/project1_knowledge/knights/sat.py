@@ -0,0 +1,350 @@
+"""
+SAT-based entailment for logic.py
+
+Knowledge entails a query exactly when knowledge ∧ ¬query has no model, so
+instead of enumerating all 2^n models, that sentence is converted to
+conjunctive normal form and handed to a SAT solver.
+
+The conversion is Tseitin's: every And, Or, Implication and Biconditional
+gets a new variable defined to be equivalent to it, so the CNF grows
+linearly with the sentence instead of exponentially.
+
+The solver is DPLL with conflict-driven clause learning: unit propagation
+over two watched literals per clause, learning the first-UIP clause of every
+conflict and jumping back to the level where it becomes unit, variable
+activity for choosing decisions, saved phases and periodic restarts.
+"""
+
+import heapq
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+class CNF():
+    """
+    Clauses over integer variables 1, 2, 3...: a literal is a variable
+    (true) or its negation (false), and a clause is a list of literals.
+    `variables` maps each symbol name to its variable; the other variables
+    are Tseitin definitions.
+    """
+
+    def __init__(self):
+        self.variables = {}
+        self.num_variables = 0
+        self.clauses = []
+        # Sentence -> literal equivalent to it, so repeated subsentences
+        # are only defined once
+        self.literals = {}
+
+    def new_variable(self):
+        self.num_variables += 1
+        return self.num_variables
+
+    def add_clause(self, literals):
+        """Adds a clause, dropping repeated literals and tautologies."""
+        clause = list(dict.fromkeys(literals))
+        if any(-literal in clause for literal in clause):
+            return
+        self.clauses.append(clause)
+
+    def add(self, sentence):
+        """Adds sentence as something that must be true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.add_clause([self.literal(disjunct) for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.add_clause([-self.literal(sentence.antecedent), self.literal(sentence.consequent)])
+        else:
+            self.add_clause([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to sentence, defining it if needed."""
+        if sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, Symbol):
+            literal = self.variables[sentence.name] = self.new_variable()
+        elif isinstance(sentence, Not):
+            literal = -self.literal(sentence.operand)
+        elif isinstance(sentence, And):
+            operands = [self.literal(conjunct) for conjunct in sentence.conjuncts]
+            literal = self.new_variable()
+            # literal => every conjunct, and all conjuncts => literal
+            for operand in operands:
+                self.add_clause([-literal, operand])
+            self.add_clause([literal] + [-operand for operand in operands])
+        elif isinstance(sentence, Or):
+            literal = self.define_or([self.literal(disjunct) for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            literal = self.define_or([-self.literal(sentence.antecedent), self.literal(sentence.consequent)])
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            literal = self.new_variable()
+            self.add_clause([-literal, -left, right])
+            self.add_clause([-literal, left, -right])
+            self.add_clause([literal, left, right])
+            self.add_clause([literal, -left, -right])
+        else:
+            raise TypeError(f"cannot convert {type(sentence).__name__} to CNF")
+
+        self.literals[sentence] = literal
+        return literal
+
+    def define_or(self, operands):
+        literal = self.new_variable()
+        # every disjunct => literal, and literal => some disjunct
+        for operand in operands:
+            self.add_clause([literal, -operand])
+        self.add_clause([-literal] + operands)
+        return literal
+
+
+class Solver():
+    """
+    A CDCL SAT solver. solve() returns a model as a list of booleans indexed
+    by variable (index 0 unused), or None if the clauses are unsatisfiable.
+    """
+
+    RESTART_FIRST = 100
+    RESTART_GROWTH = 1.5
+    DECAY = 0.95
+
+    def __init__(self, num_variables, clauses):
+        self.num_variables = num_variables
+        self.clauses = []
+        self.watches = {}
+        for variable in range(1, num_variables + 1):
+            self.watches[variable] = []
+            self.watches[-variable] = []
+
+        # value[v] is 1 (true), -1 (false) or 0 (unassigned)
+        self.value = [0] * (num_variables + 1)
+        self.level = [0] * (num_variables + 1)
+        self.reason = [None] * (num_variables + 1)
+        self.phase = [-1] * (num_variables + 1)
+        self.activity = [0.0] * (num_variables + 1)
+        self.bump = 1.0
+        self.heap = [(0.0, variable) for variable in range(1, num_variables + 1)]
+
+        # Assigned literals in order, where each decision level starts,
+        # and the next literal whose consequences have not been propagated
+        self.trail = []
+        self.levels = []
+        self.propagated = 0
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+        self.unsatisfiable = False
+        for clause in clauses:
+            if not clause:
+                self.unsatisfiable = True
+            elif len(clause) == 1:
+                if not self.assign(clause[0], None):
+                    self.unsatisfiable = True
+            else:
+                self.attach(list(clause))
+
+    def literal_value(self, literal):
+        value = self.value[abs(literal)]
+        return value if literal > 0 else -value
+
+    def attach(self, clause):
+        """Adds a clause of two or more literals, watching the first two."""
+        self.clauses.append(clause)
+        index = len(self.clauses) - 1
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+        return index
+
+    def assign(self, literal, reason):
+        """Makes literal true. Returns False if it is already false."""
+        value = self.literal_value(literal)
+        if value:
+            return value > 0
+        variable = abs(literal)
+        self.value[variable] = 1 if literal > 0 else -1
+        self.level[variable] = len(self.levels)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+        return True
+
+    def propagate(self):
+        """
+        Assigns every literal forced by unit clauses.
+        Returns the index of a clause made false, or None.
+        """
+        while self.propagated < len(self.trail):
+            false_literal = -self.trail[self.propagated]
+            self.propagated += 1
+            self.propagations += 1
+
+            watching = self.watches[false_literal]
+            self.watches[false_literal] = kept = []
+            for position, index in enumerate(watching):
+                clause = self.clauses[index]
+                # Keep the false literal in clause[1]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.literal_value(clause[0]) > 0:
+                    kept.append(index)
+                    continue
+
+                # Watch some other literal that is not false
+                for k in range(2, len(clause)):
+                    if self.literal_value(clause[k]) >= 0:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    # clause[0] is the only literal left: unit or conflict
+                    if not self.assign(clause[0], index):
+                        kept.extend(watching[position + 1:])
+                        return index
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns (learned clause, level to jump back to) for a conflict.
+        The learned clause's first literal is the only one assigned at the
+        current level (the first unique implication point).
+        """
+        learned = [None]
+        seen = set()
+        current = len(self.levels)
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        index = conflict
+
+        while True:
+            clause = self.clauses[index]
+            # A reason clause's first literal is the one it implied
+            for other in (clause if literal is None else clause[1:]):
+                variable = abs(other)
+                if variable in seen or self.level[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump_activity(variable)
+                if self.level[variable] == current:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # The most recent literal of this level that took part
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            index = self.reason[abs(literal)]
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+        # Watch the literal assigned last among the rest, so the clause
+        # becomes unit when jumping back to its level
+        highest = max(range(1, len(learned)), key=lambda i: self.level[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.level[abs(learned[1])]
+
+    def bump_activity(self, variable):
+        self.activity[variable] += self.bump
+        if self.activity[variable] > 1e100:
+            # Rescale everything before the floats overflow
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.bump *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_variables + 1) if not self.value[v]]
+            heapq.heapify(self.heap)
+        elif not self.value[variable]:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """Undoes every assignment made above the given decision level."""
+        if len(self.levels) <= level:
+            return
+        start = self.levels[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phase[variable] = self.value[variable]
+            self.value[variable] = 0
+            self.reason[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.levels[level:]
+        self.propagated = len(self.trail)
+
+    def decide(self):
+        """Returns the unassigned variable with the highest activity, or None."""
+        while self.heap:
+            activity, variable = heapq.heappop(self.heap)
+            # Skip assigned variables and outdated entries
+            if not self.value[variable] and -activity == self.activity[variable]:
+                return variable
+        for variable in range(1, self.num_variables + 1):
+            if not self.value[variable]:
+                return variable
+        return None
+
+    def solve(self):
+        if self.unsatisfiable:
+            return None
+        restart_at = self.RESTART_FIRST
+        since_restart = 0
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.levels:
+                    return None
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.assign(learned[0], self.attach(learned))
+                self.bump /= self.DECAY
+                continue
+
+            if since_restart >= restart_at:
+                since_restart = 0
+                restart_at *= self.RESTART_GROWTH
+                self.backtrack(0)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                return [None] + [value > 0 for value in self.value[1:]]
+            self.decisions += 1
+            self.levels.append(len(self.trail))
+            self.assign(variable * self.phase[variable], None)
+
+
+def satisfiable(sentence):
+    """
+    Returns a model of sentence as a dict of symbol names to booleans,
+    or None if it has no model.
+    """
+    cnf = CNF()
+    cnf.add(sentence)
+    model = Solver(cnf.num_variables, cnf.clauses).solve()
+    if model is None:
+        return None
+    return {name: model[variable] for name, variable in cnf.variables.items()}
+
+
+def entails(knowledge, query):
+    """Checks if knowledge base entails query by refuting knowledge ∧ ¬query."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return Solver(cnf.num_variables, cnf.clauses).solve() is None
@@ -0,0 +1,39 @@
+import multiprocessing
+import pickle
+
+from logic import INTERNED, And, Not, Or, Symbol, intern
+
+
+def compare_in_process(data):
+    """
+    Runs in a spawned process, where string hashes differ from the parent's.
+    Returns how each unpickled sentence compares to its plain equivalent.
+    """
+    results = []
+    for sentence, plain in pickle.loads(data):
+        results.append((
+            sentence == plain,
+            hash(sentence) == hash(plain),
+            len({sentence, plain}),
+            sentence is intern(plain),
+        ))
+    return results
+
+
+def test_pickle_round_trip_in_spawned_process():
+    A, B = Symbol("P0"), Symbol("P1")
+    pairs = [
+        (intern(A), Symbol("P0")),
+        (intern(And(A, Not(B))), And(Symbol("P0"), Not(Symbol("P1")))),
+    ]
+    data = pickle.dumps(pairs)
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        results = pool.apply(compare_in_process, (data,))
+    assert results == [(True, True, 1, True)] * len(pairs)
+
+
+def test_pickle_round_trip_reinterns():
+    sentence = intern(Or(Symbol("P0"), And(Symbol("P0"), Symbol("P1"))))
+    copy = pickle.loads(pickle.dumps(sentence))
+    assert copy is sentence
+    assert INTERNED[(type(sentence), tuple(sentence.disjuncts))] is sentence
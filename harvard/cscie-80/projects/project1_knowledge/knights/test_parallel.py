@@ -0,0 +1,20 @@
+import multiprocessing
+
+import parallel
+import truthtable
+from logic import And, Implication, Not, Or, Symbol, intern
+
+
+def test_check_interned_knowledge_with_spawn():
+    context = multiprocessing.get_context("spawn")
+    A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+    cases = [
+        (intern(And(A, B)), Symbol("A")),
+        (intern(And(A, B)), Not(Symbol("A"))),
+        (intern(And(Implication(A, B), Implication(B, C), Or(A, C))), intern(C)),
+        (intern(And(Implication(A, B), Or(A, C))), intern(B)),
+    ]
+    for knowledge, query in cases:
+        entailed, stats = parallel.check(knowledge, query, workers=2, context=context)
+        assert stats["prefixes"] > 1
+        assert entailed == truthtable.entails(knowledge, query)
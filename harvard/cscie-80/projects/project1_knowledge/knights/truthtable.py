@@ -0,0 +1,151 @@
+"""
+Compiled truth tables for logic.py
+
+model_check walks the Sentence tree once for each of the 2^n models. Here
+the sentences are instead compiled once into a flat list of instructions,
+and each instruction is run on many models at a time: a value is an integer
+whose bit m is the value in model m, so one `&` evaluates an And over a
+whole chunk of models.
+
+Symbol i of the first `chunk_bits` symbols is true in model m of a chunk if
+bit i of m is set. The remaining symbols are the same in every model of a
+chunk (all ones or all zeros), and take each combination in turn, one chunk
+after another.
+"""
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+# Default number of symbols enumerated inside a chunk: 2^16 models per chunk
+CHUNK_BITS = 16
+
+# Instruction opcodes
+SYMBOL, NOT, AND, OR, IMPLIES, IFF = range(6)
+
+
+class Program():
+    """
+    Sentences compiled to a list of (opcode, operands) instructions, where
+    the value of register r is the result of instruction r. More sentences
+    can be added with compile() at any time; each new symbol becomes the
+    next entry of `symbols`. `outputs` is the register of each sentence
+    passed to the constructor.
+    """
+
+    def __init__(self, sentences=()):
+        self.symbols = []
+        self.instructions = []
+        # Structurally equal subsentences share one register
+        self.registers = {}
+        self.outputs = [self.compile(sentence) for sentence in sentences]
+
+    def compile(self, sentence):
+        """Returns the register holding the value of sentence."""
+        if sentence in self.registers:
+            return self.registers[sentence]
+
+        if isinstance(sentence, Symbol):
+            instruction = (SYMBOL, (len(self.symbols),))
+            self.symbols.append(sentence.name)
+        elif isinstance(sentence, Not):
+            instruction = (NOT, (self.compile(sentence.operand),))
+        elif isinstance(sentence, And):
+            instruction = (AND, tuple(self.compile(conjunct) for conjunct in sentence.conjuncts))
+        elif isinstance(sentence, Or):
+            instruction = (OR, tuple(self.compile(disjunct) for disjunct in sentence.disjuncts))
+        elif isinstance(sentence, Implication):
+            instruction = (IMPLIES, (self.compile(sentence.antecedent), self.compile(sentence.consequent)))
+        elif isinstance(sentence, Biconditional):
+            instruction = (IFF, (self.compile(sentence.left), self.compile(sentence.right)))
+        else:
+            raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+        self.instructions.append(instruction)
+        register = len(self.instructions) - 1
+        self.registers[sentence] = register
+        return register
+
+    def truncate(self, size):
+        """Forgets every register from `size` on, and the symbols they load."""
+        del self.instructions[size:]
+        del self.symbols[sum(opcode == SYMBOL for opcode, _ in self.instructions):]
+        self.registers = {sentence: r for sentence, r in self.registers.items() if r < size}
+
+    def num_chunks(self, chunk_bits=CHUNK_BITS):
+        """Returns how many chunks chunks() yields."""
+        return 1 << max(len(self.symbols) - chunk_bits, 0)
+
+    def chunks(self, chunk_bits=CHUNK_BITS, outputs=None, start=0, stop=None):
+        """
+        Yields (first, width, values) for every chunk of models, where
+        models first to first + width - 1 are bits 0 to width - 1 of the
+        value of each register in outputs (by default self.outputs).
+        Only chunks start to stop - 1 are evaluated, if given.
+        """
+        if outputs is None:
+            outputs = self.outputs
+        low = min(len(self.symbols), chunk_bits)
+        high = len(self.symbols) - low
+        width = 1 << low
+        full = (1 << width) - 1
+        patterns = [low_pattern(i, full) for i in range(low)]
+
+        for chunk in range(start, (1 << high) if stop is None else stop):
+            symbols = patterns + [full if chunk >> i & 1 else 0 for i in range(high)]
+            registers = []
+            for opcode, operands in self.instructions:
+                if opcode == AND:
+                    value = full
+                    for operand in operands:
+                        value &= registers[operand]
+                elif opcode == OR:
+                    value = 0
+                    for operand in operands:
+                        value |= registers[operand]
+                elif opcode == NOT:
+                    value = full ^ registers[operands[0]]
+                elif opcode == SYMBOL:
+                    value = symbols[operands[0]]
+                elif opcode == IMPLIES:
+                    value = (full ^ registers[operands[0]]) | registers[operands[1]]
+                else:
+                    value = full ^ registers[operands[0]] ^ registers[operands[1]]
+                registers.append(value)
+            yield chunk * width, width, [registers[output] for output in outputs]
+
+    def model(self, index):
+        """Returns the model with the given index as a dict."""
+        return {name: bool(index >> i & 1) for i, name in enumerate(self.symbols)}
+
+
+def low_pattern(i, full):
+    """
+    Returns the value of symbol i within a chunk: bit m is bit i of m,
+    i.e. runs of 2^i zeros and 2^i ones, repeated across the chunk.
+    """
+    run = 1 << i
+    # full // (2^(2 * run) - 1) has a 1 at the start of every period
+    return full // ((1 << (2 * run)) - 1) * (((1 << run) - 1) << run)
+
+
+def entails(knowledge, query, chunk_bits=CHUNK_BITS):
+    """Checks if knowledge base entails query, a chunk of models at a time."""
+    program = Program([knowledge, query])
+    for _, _, (kb, q) in program.chunks(chunk_bits):
+        # A model where the knowledge base holds and the query does not
+        if kb & ~q:
+            return False
+    return True
+
+
+def counter_model(knowledge, query, chunk_bits=CHUNK_BITS):
+    """
+    Returns a model where knowledge holds and query does not, or None if
+    knowledge entails query.
+    """
+    program = Program([knowledge, query])
+    for first, _, (kb, q) in program.chunks(chunk_bits):
+        counter = kb & ~q
+        if counter:
+            # Index of the lowest set bit
+            return program.model(first + (counter & -counter).bit_length() - 1)
+    return None
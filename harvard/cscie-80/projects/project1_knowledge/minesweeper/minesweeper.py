@@ -1,5 +1,6 @@
 import itertools
 import random
+from collections import deque
 
 
 class Minesweeper():
@@ -142,6 +143,112 @@ class Sentence():
             self.cells.remove(cell)
 
 
+class KnowledgeStore():
+    """
+    The AI's sentences, indexed by cell
+    Sentences are keyed by their set of cells, so equal sentences are only
+    stored once, and empty sentences are dropped. Every new or changed
+    sentence is queued, so inference only looks at sentences that changed
+    instead of every pair of sentences.
+    """
+
+    def __init__(self):
+        # frozenset of cells -> Sentence
+        self.sentences = dict()
+        # cell -> keys of the sentences containing it
+        self.by_cell = dict()
+        # Keys of sentences that are new or changed since they were examined
+        self.changed = deque()
+        self.queued = set()
+
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def __contains__(self, sentence):
+        known = self.sentences.get(frozenset(sentence.cells))
+        return known is not None and known.count == sentence.count
+
+    def add(self, sentence):
+        """
+        Adds a sentence, unless it is empty or already known.
+        """
+        key = frozenset(sentence.cells)
+        if not key or key in self.sentences:
+            return
+        self.sentences[key] = sentence
+        for cell in key:
+            self.by_cell.setdefault(cell, set()).add(key)
+        if key not in self.queued:
+            self.queued.add(key)
+            self.changed.append(key)
+
+    def remove(self, sentence):
+        key = frozenset(sentence.cells)
+        del self.sentences[key]
+        for cell in key:
+            keys = self.by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self.by_cell[cell]
+
+    def mark_mine(self, cell):
+        """
+        Updates the sentences containing cell, given that it is a mine.
+        """
+        for key in list(self.by_cell.get(cell, ())):
+            sentence = self.sentences[key]
+            self.remove(sentence)
+            sentence.mark_mine(cell)
+            self.add(sentence)
+
+    def mark_safe(self, cell):
+        """
+        Updates the sentences containing cell, given that it is safe.
+        """
+        for key in list(self.by_cell.get(cell, ())):
+            sentence = self.sentences[key]
+            self.remove(sentence)
+            sentence.mark_safe(cell)
+            self.add(sentence)
+
+    def next_changed(self):
+        """
+        Returns the next new or changed sentence, or None if there is none.
+        """
+        while self.changed:
+            key = self.changed.popleft()
+            self.queued.discard(key)
+            # Skip sentences that were changed or removed after being queued
+            if key in self.sentences:
+                return self.sentences[key]
+        return None
+
+    def infer_subsets(self, sentence):
+        """
+        Compares sentence with every sentence it shares a cell with. If the
+        cells of one are a subset of the other's, the bigger sentence is
+        replaced by the difference: cells2 - cells1 = count2 - count1.
+        """
+        key = frozenset(sentence.cells)
+        others = set().union(*(self.by_cell[cell] for cell in key))
+        others.discard(key)
+        for other_key in others:
+            other = self.sentences.get(other_key)
+            if other is None:
+                continue
+            if other_key < key:
+                # sentence itself is replaced, the new one is queued
+                self.remove(sentence)
+                self.add(Sentence(key - other_key, sentence.count - other.count))
+                return
+            if key < other_key:
+                self.remove(other)
+                self.add(Sentence(other_key - key, other.count - sentence.count))
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
@@ -160,8 +267,8 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Sentences about the game known to be true
+        self.knowledge = KnowledgeStore()
 
     def mark_mine(self, cell):
         """
@@ -169,8 +276,7 @@ class MinesweeperAI():
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.knowledge.mark_mine(cell)
 
     def mark_safe(self, cell):
         """
@@ -178,8 +284,7 @@ class MinesweeperAI():
         to mark that cell as safe as well.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self.knowledge.mark_safe(cell)
 
     def add_knowledge(self, cell, count):
         """
@@ -226,46 +331,27 @@ class MinesweeperAI():
 
         # Form a sentence based on the neighbors and count
         new_knowledge = Sentence(neighbors, count_in_new_knowledge)
-        self.knowledge.append(new_knowledge)
-
-        # 4) Mark any additional cells as safes are mines
-        while (True):
-            safes_found = False
-            mines_found = False
-            for sentence in self.knowledge:
-                if sentence.known_safes():    # Safes found
-                    for cell in list(sentence.known_safes()):
-                        self.mark_safe(cell)
-                        safes_found = True
-                if sentence.known_mines():    # Mines found
-                    for cell in list(sentence.known_mines()):
-                        self.mark_mine(cell)
-                        mines_found = True
-
-            # 5) Add any new sentences to the knowledge if possible
-
-            new_sentence_formed = False
-
-            for sentence1 in self.knowledge:
-                if sentence1.cells:  # Ignore if the sentence is empty
-                    for sentence2 in self.knowledge:
-                        if sentence2.cells:  # Ignore if the sentence is empty
-                            if sentence1.cells != sentence2.cells and sentence1.cells.issubset(sentence2.cells):
-                                # Subset found, let's make a new sentence
-                                new_knolwedge = Sentence(
-                                    sentence2.cells - sentence1.cells,
-                                    sentence2.count - sentence1.count,
-                                )
-                                self.knowledge.append(new_knolwedge)
-                                # Remove the bigger set from the knowledge, otherwise it can cause infinite loop
-                                self.knowledge.remove(sentence2) 
-                                new_sentence_formed = True
-                                                             
-            # Only if all the three conditions are false, break out of this loop
-            if not (safes_found or mines_found or new_sentence_formed):
-                # self.printStatus()
+        self.knowledge.add(new_knowledge)
+
+        # Examine each new or changed sentence until nothing changes
+        while True:
+            sentence = self.knowledge.next_changed()
+            if sentence is None:
                 break
 
+            # 4) Mark any additional cells as safes or mines
+            if sentence.known_safes():
+                for cell in list(sentence.known_safes()):
+                    self.mark_safe(cell)
+                continue
+            if sentence.known_mines():
+                for cell in list(sentence.known_mines()):
+                    self.mark_mine(cell)
+                continue
+
+            # 5) Add any new sentences that follow from a subset
+            self.knowledge.infer_subsets(sentence)
+
     def make_safe_move(self):
         """
         Returns a safe cell to choose on the Minesweeper board.
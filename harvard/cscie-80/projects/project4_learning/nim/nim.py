@@ -40,6 +40,22 @@ class Nim():
         """
         return 0 if player == 1 else 1
 
+    @classmethod
+    def canonical(cls, piles):
+        """
+        Nim.canonical(piles) returns `(state, positions)`: the piles sorted
+        into a tuple, which is the same for every ordering of the same piles,
+        and a list mapping each pile index to its index in `state`.
+
+        Piles of equal size all map to the first of them, since taking
+        from either leads to equivalent states.
+        """
+        state = tuple(sorted(piles))
+        first = {}
+        for i, pile in enumerate(state):
+            first.setdefault(pile, i)
+        return state, [first[pile] for pile in piles]
+
     def switch_player(self):
         """
         Switch the current player to the other player.
@@ -72,7 +88,7 @@ class Nim():
 
 class NimAI():
 
-    def __init__(self, alpha=0.5, epsilon=0.1):
+    def __init__(self, alpha=0.5, epsilon=0.1, symmetric=False):
         """
         Initialize AI with an empty Q-learning dictionary,
         an alpha (learning) rate, and an epsilon rate.
@@ -81,10 +97,25 @@ class NimAI():
         pairs to a Q-value (a number).
          - `state` is a tuple of remaining piles, e.g. (1, 1, 4, 4)
          - `action` is a tuple `(i, j)` for an action
+
+        If `symmetric` is `True`, states are stored in their
+        canonical (sorted) form, see `Nim.canonical`, so orderings
+        of the same piles share their Q-values.
         """
         self.q = dict()
         self.alpha = alpha
         self.epsilon = epsilon
+        self.symmetric = symmetric
+
+    def key(self, state, action):
+        """
+        Return the key of `(state, action)` in `self.q`.
+        """
+        if not self.symmetric:
+            return (tuple(state), action)
+        state, positions = Nim.canonical(state)
+        i, j = action
+        return (state, (positions[i], j))
 
     def update(self, old_state, action, new_state, reward):
         """
@@ -101,7 +132,7 @@ class NimAI():
         Return the Q-value for the state `state` and the action `action`.
         If no Q-value exists yet in `self.q`, return 0.
         """
-        return self.q.get((tuple(state), action), 0)
+        return self.q.get(self.key(state, action), 0)
 
     def update_q_value(self, state, action, old_q, reward, future_rewards):
         """
@@ -123,7 +154,7 @@ class NimAI():
 
         # Update the queue value with the new q value
 
-        self.q[tuple(state), action] = new_q
+        self.q[self.key(state, action)] = new_q
 
     def best_future_reward(self, state):
         """
@@ -187,12 +218,12 @@ class NimAI():
             return best_action
         
 
-def train(n):
+def train(n, symmetric=False):
     """
     Train an AI by playing `n` games against itself.
     """
 
-    player = NimAI()
+    player = NimAI(symmetric=symmetric)
 
     # Play n games
     for i in range(n):
@@ -240,7 +271,7 @@ def train(n):
                     0
                 )
 
-    print("Done training")
+    print(f"Done training ({len(player.q)} Q-values stored)")
 
     # Return the trained AI
     return player